@@ -0,0 +1,550 @@
+"""
+Phase 1B Scenario Table
+
+Static definitions for the 25 Phase 1B scenarios (S1-S25). Each entry is the
+keyword arguments for ScenarioGenerator.create_scenario in
+generate_scenarios_phase1b.py; tool results are generated from these at
+build time.
+
+- S1-S5: Web-only
+- S6-S13: Infrastructure
+- S14-S20: Hybrid
+- S21-S25: Edge cases (test set)
+"""
+
+
+# Scenario definitions (S1-S25), passed as keyword arguments to create_scenario
+SCENARIO_SPECS = (
+    # === WEB-ONLY SCENARIOS (5) ===
+    
+    # S1: Modern Web Startup
+    {
+        'scenario_id': 'phase1b_web_startup',
+        'name': 'Modern Web Startup',
+        'description': 'SaaS startup with microservices on standard web ports',
+        'target': 'startup.example.com',
+        'complexity': 'medium',
+        'subdomain_count': 18,
+        'ports': [80, 443, 3000, 8080],
+        'technologies': ['React', 'Node.js', 'Express.js', 'Nginx', 'Docker'],
+        'optimal_strategy': {
+            'subfinder_mode': 'comprehensive',
+            'httpx_mode': 'full',
+            'nmap_mode': 'skip',
+            'reason': 'Pure web stack, no infra services. Nmap wastes time.'
+        },
+        'reward_optimal': 480,
+        'reward_suboptimal': 320,
+        'scenario_type': 'web_startup',
+    },
+    
+    # S2: CDN-Heavy E-commerce
+    {
+        'scenario_id': 'phase1b_cdn_ecommerce',
+        'name': 'CDN-Heavy E-commerce',
+        'description': 'E-commerce site behind Cloudflare, minimal exposed services',
+        'target': 'shop.example.com',
+        'complexity': 'low',
+        'subdomain_count': 12,
+        'ports': [443],
+        'technologies': ['Cloudflare', 'WordPress', 'WooCommerce', 'Nginx'],
+        'optimal_strategy': {
+            'subfinder_mode': 'active',
+            'httpx_mode': 'detailed',
+            'nmap_mode': 'skip',
+            'reason': 'Only HTTPS behind CDN. Nmap gives no value.'
+        },
+        'reward_optimal': 420,
+        'reward_suboptimal': 280,
+        'scenario_type': 'web_cdn',
+    },
+    
+    # S3: API Gateway Architecture
+    {
+        'scenario_id': 'phase1b_api_gateway',
+        'name': 'API Gateway Architecture',
+        'description': 'Microservices behind API gateway, RESTful APIs',
+        'target': 'api.example.com',
+        'complexity': 'medium',
+        'subdomain_count': 15,
+        'ports': [443, 8080],
+        'technologies': ['Kong', 'Express.js', 'GraphQL', 'Node.js', 'Docker'],
+        'optimal_strategy': {
+            'subfinder_mode': 'comprehensive',
+            'httpx_mode': 'full',
+            'nmap_mode': 'skip',
+            'reason': 'API-only, no backend services exposed.'
+        },
+        'reward_optimal': 490,
+        'reward_suboptimal': 330,
+        'scenario_type': 'web_api',
+    },
+    
+    # S4: Multi-Web-Server Load Balanced
+    {
+        'scenario_id': 'phase1b_load_balanced',
+        'name': 'Load Balanced Web Farm',
+        'description': 'Multiple web servers behind load balancer',
+        'target': 'web.example.com',
+        'complexity': 'high',
+        'subdomain_count': 22,
+        'ports': [80, 443, 8080, 8443],
+        'technologies': ['HAProxy', 'Apache', 'Nginx', 'PHP', 'Laravel'],
+        'optimal_strategy': {
+            'subfinder_mode': 'comprehensive',
+            'httpx_mode': 'full',
+            'nmap_mode': 'skip',
+            'reason': 'Load balancer + web servers only. No infra.'
+        },
+        'reward_optimal': 510,
+        'reward_suboptimal': 350,
+        'scenario_type': 'web_loadbalanced',
+    },
+    
+    # S5: Development Environment (Web-Only)
+    {
+        'scenario_id': 'phase1b_dev_web',
+        'name': 'Development Web Environment',
+        'description': 'Development servers for frontend/backend testing',
+        'target': 'dev.example.com',
+        'complexity': 'medium',
+        'subdomain_count': 16,
+        'ports': [3000, 8080, 8081],
+        'technologies': ['Vite', 'Webpack', 'Express.js', 'React', 'Vue.js'],
+        'optimal_strategy': {
+            'subfinder_mode': 'active',
+            'httpx_mode': 'thorough',
+            'nmap_mode': 'skip',
+            'reason': 'Dev servers, all web-based. No databases exposed.'
+        },
+        'reward_optimal': 450,
+        'reward_suboptimal': 310,
+        'scenario_type': 'web_dev',
+    },
+    
+    # === INFRASTRUCTURE SCENARIOS (8) ===
+    
+    # S6: Database Server Cluster
+    {
+        'scenario_id': 'phase1b_database_cluster',
+        'name': 'Database Server Cluster',
+        'description': 'Production database servers with multiple DB types',
+        'target': 'db.example.com',
+        'complexity': 'very_high',
+        'subdomain_count': 8,
+        'ports': [80, 443, 3306, 5432, 6379, 27017],
+        'technologies': ['MySQL', 'PostgreSQL', 'Redis', 'MongoDB', 'phpMyAdmin'],
+        'optimal_strategy': {
+            'subfinder_mode': 'active',
+            'httpx_mode': 'basic',
+            'nmap_mode': 'service',
+            'reason': 'CRITICAL: Need service versions for all databases!'
+        },
+        'reward_optimal': 820,
+        'reward_suboptimal': 320,
+        'scenario_type': 'infra_database',
+    },
+    
+    # S7: Mail Server Infrastructure
+    {
+        'scenario_id': 'phase1b_mail_server',
+        'name': 'Mail Server Infrastructure',
+        'description': 'Enterprise mail server with SMTP/IMAP/POP3',
+        'target': 'mail.example.com',
+        'complexity': 'high',
+        'subdomain_count': 6,
+        'ports': [25, 143, 587, 993, 995],
+        'technologies': ['Postfix', 'Dovecot', 'SpamAssassin', 'ClamAV'],
+        'optimal_strategy': {
+            'subfinder_mode': 'passive',
+            'httpx_mode': 'quick',
+            'nmap_mode': 'full',
+            'reason': 'Mail services NEED version detection for vulnerabilities.'
+        },
+        'reward_optimal': 780,
+        'reward_suboptimal': 290,
+        'scenario_type': 'infra_mail',
+    },
+    
+    # S8: SSH Infrastructure
+    {
+        'scenario_id': 'phase1b_ssh_infra',
+        'name': 'SSH Infrastructure',
+        'description': 'Server farm with SSH access and backend services',
+        'target': 'infra.example.com',
+        'complexity': 'high',
+        'subdomain_count': 10,
+        'ports': [22, 80, 443, 3306, 6379],
+        'technologies': ['OpenSSH', 'MySQL', 'Redis', 'Ubuntu', 'Nginx'],
+        'optimal_strategy': {
+            'subfinder_mode': 'comprehensive',
+            'httpx_mode': 'thorough',
+            'nmap_mode': 'service',
+            'reason': 'SSH + databases = need version info!'
+        },
+        'reward_optimal': 850,
+        'reward_suboptimal': 340,
+        'scenario_type': 'infra_ssh',
+    },
+    
+    # S9: Enterprise Windows Domain
+    {
+        'scenario_id': 'phase1b_enterprise_windows',
+        'name': 'Enterprise Windows Domain',
+        'description': 'Windows AD environment with RDP/SMB/MSSQL',
+        'target': 'corp.example.com',
+        'complexity': 'very_high',
+        'subdomain_count': 12,
+        'ports': [80, 443, 445, 1433, 3389],
+        'technologies': ['Windows Server', 'Active Directory', 'MSSQL', 'IIS'],
+        'optimal_strategy': {
+            'subfinder_mode': 'comprehensive',
+            'httpx_mode': 'full',
+            'nmap_mode': 'service',
+            'reason': 'Windows infrastructure = CRITICAL service detection!'
+        },
+        'reward_optimal': 880,
+        'reward_suboptimal': 350,
+        'scenario_type': 'infra_windows',
+    },
+    
+    # S10: Development Infrastructure
+    {
+        'scenario_id': 'phase1b_dev_infra',
+        'name': 'Development Infrastructure',
+        'description': 'Dev servers with databases and CI/CD',
+        'target': 'dev-infra.example.com',
+        'complexity': 'high',
+        'subdomain_count': 14,
+        'ports': [22, 80, 443, 5432, 8080, 9000],
+        'technologies': ['Jenkins', 'PostgreSQL', 'Docker', 'GitLab', 'Nginx'],
+        'optimal_strategy': {
+            'subfinder_mode': 'comprehensive',
+            'httpx_mode': 'full',
+            'nmap_mode': 'full',
+            'reason': 'Mix of CI/CD + databases = need full scan!'
+        },
+        'reward_optimal': 790,
+        'reward_suboptimal': 330,
+        'scenario_type': 'infra_dev',
+    },
+    
+    # S11: Admin Panel Infrastructure
+    {
+        'scenario_id': 'phase1b_admin_infra',
+        'name': 'Admin Panel Infrastructure',
+        'description': 'Admin interfaces and control panels',
+        'target': 'admin.example.com',
+        'complexity': 'high',
+        'subdomain_count': 9,
+        'ports': [80, 443, 8080, 8443, 9090],
+        'technologies': ['Tomcat', 'cPanel', 'Webmin', 'phpMyAdmin', 'Apache'],
+        'optimal_strategy': {
+            'subfinder_mode': 'active',
+            'httpx_mode': 'thorough',
+            'nmap_mode': 'full',
+            'reason': 'Admin panels = need to identify management software versions!'
+        },
+        'reward_optimal': 760,
+        'reward_suboptimal': 310,
+        'scenario_type': 'infra_admin',
+    },
+    
+    # S12: Monitoring Stack
+    {
+        'scenario_id': 'phase1b_monitoring',
+        'name': 'Monitoring Stack',
+        'description': 'Prometheus/Grafana/ELK monitoring infrastructure',
+        'target': 'monitor.example.com',
+        'complexity': 'very_high',
+        'subdomain_count': 11,
+        'ports': [80, 443, 3000, 9090, 9093, 9200, 5601],
+        'technologies': ['Prometheus', 'Grafana', 'Elasticsearch', 'Kibana', 'Alertmanager'],
+        'optimal_strategy': {
+            'subfinder_mode': 'comprehensive',
+            'httpx_mode': 'full',
+            'nmap_mode': 'service',
+            'reason': 'Monitoring stack = CRITICAL to identify versions!'
+        },
+        'reward_optimal': 840,
+        'reward_suboptimal': 340,
+        'scenario_type': 'infra_monitoring',
+    },
+    
+    # S13: Full Stack Infrastructure
+    {
+        'scenario_id': 'phase1b_full_stack',
+        'name': 'Full Stack Infrastructure',
+        'description': 'Complete infrastructure with all services',
+        'target': 'full.example.com',
+        'complexity': 'very_high',
+        'subdomain_count': 20,
+        'ports': [22, 80, 443, 3306, 5432, 6379, 8080, 9000],
+        'technologies': ['Full Stack', 'MySQL', 'PostgreSQL', 'Redis', 'Jenkins', 'Nginx'],
+        'optimal_strategy': {
+            'subfinder_mode': 'comprehensive',
+            'httpx_mode': 'full',
+            'nmap_mode': 'service',
+            'reason': 'Everything exposed = MUST scan everything!'
+        },
+        'reward_optimal': 920,
+        'reward_suboptimal': 380,
+        'scenario_type': 'infra_fullstack',
+    },
+    
+    # === HYBRID SCENARIOS (7) ===
+    
+    # S14: Web + Monitoring
+    {
+        'scenario_id': 'phase1b_web_monitoring',
+        'name': 'Web + Monitoring',
+        'description': 'Web application with Prometheus monitoring',
+        'target': 'webapp-mon.example.com',
+        'complexity': 'medium',
+        'subdomain_count': 13,
+        'ports': [80, 443, 9090],
+        'technologies': ['React', 'Express.js', 'Prometheus', 'Nginx'],
+        'optimal_strategy': {
+            'subfinder_mode': 'comprehensive',
+            'httpx_mode': 'full',
+            'nmap_mode': 'quick',
+            'reason': 'Mostly web, but Prometheus worth quick check.'
+        },
+        'reward_optimal': 580,
+        'reward_suboptimal': 450,
+        'scenario_type': 'hybrid_web_monitoring',
+    },
+    
+    # S15: Web + Database
+    {
+        'scenario_id': 'phase1b_web_database',
+        'name': 'Web + Database',
+        'description': 'Web application with exposed MySQL',
+        'target': 'webapp-db.example.com',
+        'complexity': 'high',
+        'subdomain_count': 11,
+        'ports': [80, 443, 3306],
+        'technologies': ['PHP', 'Laravel', 'MySQL', 'Apache'],
+        'optimal_strategy': {
+            'subfinder_mode': 'active',
+            'httpx_mode': 'thorough',
+            'nmap_mode': 'thorough',
+            'reason': 'MySQL exposed = worth thorough scan for version!'
+        },
+        'reward_optimal': 620,
+        'reward_suboptimal': 480,
+        'scenario_type': 'hybrid_web_database',
+    },
+    
+    # S16: Web + SSH
+    {
+        'scenario_id': 'phase1b_web_ssh',
+        'name': 'Web + SSH',
+        'description': 'Web servers with SSH management access',
+        'target': 'webapp-ssh.example.com',
+        'complexity': 'medium',
+        'subdomain_count': 14,
+        'ports': [22, 80, 443],
+        'technologies': ['Nginx', 'Django', 'OpenSSH', 'Python'],
+        'optimal_strategy': {
+            'subfinder_mode': 'comprehensive',
+            'httpx_mode': 'full',
+            'nmap_mode': 'quick',
+            'reason': 'Mostly web, SSH worth quick version check.'
+        },
+        'reward_optimal': 560,
+        'reward_suboptimal': 440,
+        'scenario_type': 'hybrid_web_ssh',
+    },
+    
+    # S17: Web + Redis
+    {
+        'scenario_id': 'phase1b_web_redis',
+        'name': 'Web + Redis Cache',
+        'description': 'Web application with Redis caching layer',
+        'target': 'webapp-cache.example.com',
+        'complexity': 'medium',
+        'subdomain_count': 12,
+        'ports': [80, 443, 6379],
+        'technologies': ['Node.js', 'Redis', 'React', 'Express.js'],
+        'optimal_strategy': {
+            'subfinder_mode': 'active',
+            'httpx_mode': 'thorough',
+            'nmap_mode': 'thorough',
+            'reason': 'Redis exposed = worth checking version/config!'
+        },
+        'reward_optimal': 610,
+        'reward_suboptimal': 470,
+        'scenario_type': 'hybrid_web_redis',
+    },
+    
+    # S18: Web + Multiple Backends
+    {
+        'scenario_id': 'phase1b_web_backends',
+        'name': 'Web + Multiple Backend Services',
+        'description': 'Web frontend with multiple backend microservices',
+        'target': 'webapp-micro.example.com',
+        'complexity': 'high',
+        'subdomain_count': 17,
+        'ports': [80, 443, 5000, 8080, 9000],
+        'technologies': ['React', 'Flask', 'Go', 'Node.js', 'Docker'],
+        'optimal_strategy': {
+            'subfinder_mode': 'comprehensive',
+            'httpx_mode': 'full',
+            'nmap_mode': 'thorough',
+            'reason': 'Multiple custom ports = worth identifying services!'
+        },
+        'reward_optimal': 640,
+        'reward_suboptimal': 500,
+        'scenario_type': 'hybrid_web_backends',
+    },
+    
+    # S19: Web + Admin Panel
+    {
+        'scenario_id': 'phase1b_web_admin',
+        'name': 'Web + Admin Panel',
+        'description': 'Public website with admin control panel',
+        'target': 'webapp-admin.example.com',
+        'complexity': 'medium',
+        'subdomain_count': 10,
+        'ports': [80, 443, 8443],
+        'technologies': ['WordPress', 'Admin Panel', 'Nginx', 'PHP'],
+        'optimal_strategy': {
+            'subfinder_mode': 'active',
+            'httpx_mode': 'thorough',
+            'nmap_mode': 'quick',
+            'reason': 'Admin panel on 8443 worth quick check.'
+        },
+        'reward_optimal': 570,
+        'reward_suboptimal': 450,
+        'scenario_type': 'hybrid_web_admin',
+    },
+    
+    # S20: Web + Mail Services
+    {
+        'scenario_id': 'phase1b_web_mail',
+        'name': 'Web + Mail Services',
+        'description': 'Corporate website with mail server',
+        'target': 'webapp-mail.example.com',
+        'complexity': 'high',
+        'subdomain_count': 9,
+        'ports': [80, 443, 25, 587],
+        'technologies': ['Corporate Site', 'Postfix', 'Nginx', 'WordPress'],
+        'optimal_strategy': {
+            'subfinder_mode': 'active',
+            'httpx_mode': 'detailed',
+            'nmap_mode': 'thorough',
+            'reason': 'Mail server = worth thorough version detection!'
+        },
+        'reward_optimal': 630,
+        'reward_suboptimal': 490,
+        'scenario_type': 'hybrid_web_mail',
+    },
+    
+    # === EDGE CASE SCENARIOS (5) ===
+    
+    # S21: Custom Application Ports
+    {
+        'scenario_id': 'phase1b_custom_ports',
+        'name': 'Custom Application Ports',
+        'description': 'Custom applications on non-standard ports',
+        'target': 'custom.example.com',
+        'complexity': 'medium',
+        'subdomain_count': 8,
+        'ports': [4000, 5000, 6000, 8888, 9999],
+        'technologies': ['Custom', 'Go', 'Rust', 'Node.js'],
+        'optimal_strategy': {
+            'subfinder_mode': 'active',
+            'httpx_mode': 'thorough',
+            'nmap_mode': 'full',
+            'reason': 'Custom ports = MUST identify what\'s running!'
+        },
+        'reward_optimal': 680,
+        'reward_suboptimal': 420,
+        'scenario_type': 'edge_custom',
+    },
+    
+    # S22: Pure Backend (No Web)
+    {
+        'scenario_id': 'phase1b_pure_backend',
+        'name': 'Pure Backend Infrastructure',
+        'description': 'Backend services only, no web interfaces',
+        'target': 'backend.example.com',
+        'complexity': 'high',
+        'subdomain_count': 5,
+        'ports': [22, 3306, 5432],
+        'technologies': ['Backend only', 'MySQL', 'PostgreSQL', 'OpenSSH'],
+        'optimal_strategy': {
+            'subfinder_mode': 'passive',
+            'httpx_mode': 'skip',
+            'nmap_mode': 'service',
+            'reason': 'No web = HTTPX useless, nmap critical!'
+        },
+        'reward_optimal': 720,
+        'reward_suboptimal': 350,
+        'scenario_type': 'edge_backend',
+    },
+    
+    # S23: Single Subdomain, Many Ports
+    {
+        'scenario_id': 'phase1b_single_many',
+        'name': 'Single Subdomain, Many Ports',
+        'description': 'One server running many services',
+        'target': 'server.example.com',
+        'complexity': 'very_high',
+        'subdomain_count': 1,
+        'ports': [22, 80, 443, 3306, 5432, 6379, 8080, 9000],
+        'technologies': ['All-in-one', 'MySQL', 'PostgreSQL', 'Redis', 'Jenkins', 'Nginx'],
+        'optimal_strategy': {
+            'subfinder_mode': 'passive',
+            'httpx_mode': 'thorough',
+            'nmap_mode': 'service',
+            'reason': 'Many services on one host = MUST scan all!'
+        },
+        'reward_optimal': 860,
+        'reward_suboptimal': 440,
+        'scenario_type': 'edge_single_many',
+    },
+    
+    # S24: Many Subdomains, No Standard Ports
+    {
+        'scenario_id': 'phase1b_many_nonstandard',
+        'name': 'Many Subdomains, Non-Standard Ports',
+        'description': 'Microservices on custom ports',
+        'target': 'micro.example.com',
+        'complexity': 'high',
+        'subdomain_count': 25,
+        'ports': [8081, 8082, 8083, 8084, 8085],
+        'technologies': ['Microservices', 'Docker', 'Kubernetes', 'Go'],
+        'optimal_strategy': {
+            'subfinder_mode': 'comprehensive',
+            'httpx_mode': 'full',
+            'nmap_mode': 'thorough',
+            'reason': 'Many custom ports = worth identifying services!'
+        },
+        'reward_optimal': 700,
+        'reward_suboptimal': 520,
+        'scenario_type': 'edge_many_nonstandard',
+    },
+    
+    # S25: Mixed Custom Infrastructure
+    {
+        'scenario_id': 'phase1b_mixed_custom',
+        'name': 'Mixed Custom Infrastructure',
+        'description': 'Combination of standard and custom services',
+        'target': 'mixed.example.com',
+        'complexity': 'very_high',
+        'subdomain_count': 15,
+        'ports': [80, 443, 4567, 5678, 9876],
+        'technologies': ['Mixed', 'Custom', 'Node.js', 'Python', 'Nginx'],
+        'optimal_strategy': {
+            'subfinder_mode': 'comprehensive',
+            'httpx_mode': 'full',
+            'nmap_mode': 'full',
+            'reason': 'Custom + standard = need full identification!'
+        },
+        'reward_optimal': 750,
+        'reward_suboptimal': 530,
+        'scenario_type': 'edge_mixed',
+    },
+)
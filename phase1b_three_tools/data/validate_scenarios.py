@@ -9,17 +9,52 @@ Checks:
 """
 
 import json
+import sys
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
+from generate_scenarios_phase1b import port_tuple
 
-def validate_scenario_file(filepath: str):
-    """Validate a scenario JSON file"""
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+# Reference port lists reported by Check 7 (coverage report only; FullReconEnv's
+# strategic port classes are separate and also count 5000 as web)
+CHECK7_CRITICAL_PORTS = frozenset({22, 3306, 5432, 6379, 27017, 1433, 3389, 445})
+CHECK7_WEB_PORTS = frozenset({80, 443, 8080, 8443, 3000})
+
+
+def find_duplicates(items) -> list:
+    """Return values seen more than once, in first-repeat order (single pass, no counting)"""
+    seen = set()
+    dups = {}
+    for item in items:
+        if item in seen:
+            dups[item] = None
+        else:
+            seen.add(item)
+    return list(dups)
+
+
+def load_scenario_file(filepath: str) -> dict:
+    """Read and parse a scenario JSON file"""
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+
+def validate_scenario_file(filepath: str, data: dict = None):
+    """Validate a scenario JSON file (pass data if already loaded)"""
     
     print(f"\n📝 Validating: {filepath}")
     print("=" * 60)
     
-    with open(filepath, 'r') as f:
-        data = json.load(f)
+    if data is None:
+        data = load_scenario_file(filepath)
     
     scenarios = data['scenarios']
     print(f"Total scenarios: {len(scenarios)}")
@@ -30,15 +65,21 @@ def validate_scenario_file(filepath: str):
                       'scenario_type', 'metadata', 'tool_results', 
                       'optimal_strategy', 'rewards']
     
+    # Per-scenario lines are buffered and written once per check block
+    buf = []
+    append = buf.append
     for i, scenario in enumerate(scenarios):
         missing = [f for f in required_fields if f not in scenario]
         if missing:
-            print(f"   ❌ Scenario {i+1}: Missing fields: {missing}")
+            append(f"   ❌ Scenario {i+1}: Missing fields: {missing}")
         else:
-            print(f"   ✅ Scenario {i+1} ({scenario['id']}): All fields present")
+            append(f"   ✅ Scenario {i+1} ({scenario['id']}): All fields present")
+    sys.stdout.write('\n'.join(buf) + '\n')
     
     # Check 2: Tool results present
     print("\n✅ Check 2: Tool results completeness")
+    buf = []
+    append = buf.append
     for i, scenario in enumerate(scenarios):
         tool_results = scenario['tool_results']
         has_subfinder = 'subfinder' in tool_results
@@ -46,24 +87,29 @@ def validate_scenario_file(filepath: str):
         has_nmap = 'nmap' in tool_results
         
         if has_subfinder and has_httpx and has_nmap:
-            print(f"   ✅ Scenario {i+1}: All 3 tool results present")
+            append(f"   ✅ Scenario {i+1}: All 3 tool results present")
         else:
-            print(f"   ❌ Scenario {i+1}: Missing tools")
+            append(f"   ❌ Scenario {i+1}: Missing tools")
+    sys.stdout.write('\n'.join(buf) + '\n')
     
     # Check 3: Reward differentiation
     print("\n✅ Check 3: Reward differentiation")
     reward_diffs = []
+    buf = []
+    append = buf.append
     for i, scenario in enumerate(scenarios):
-        opt = scenario['rewards']['optimal']
-        subopt = scenario['rewards']['suboptimal']
+        rewards = scenario['rewards']
+        opt = rewards['optimal']
+        subopt = rewards['suboptimal']
         diff = opt - subopt
         diff_pct = (diff / opt) * 100
         reward_diffs.append(diff)
         
         if diff >= 100:  # At least 100 reward difference
-            print(f"   ✅ Scenario {i+1}: Δ={diff} ({diff_pct:.1f}%)")
+            append(f"   ✅ Scenario {i+1}: Δ={diff} ({diff_pct:.1f}%)")
         else:
-            print(f"   ⚠️  Scenario {i+1}: Δ={diff} ({diff_pct:.1f}%) - Low differentiation!")
+            append(f"   ⚠️  Scenario {i+1}: Δ={diff} ({diff_pct:.1f}%) - Low differentiation!")
+    sys.stdout.write('\n'.join(buf) + '\n')
     
     print(f"\n   Average reward difference: {sum(reward_diffs)/len(reward_diffs):.1f}")
     
@@ -71,11 +117,11 @@ def validate_scenario_file(filepath: str):
     print("\n✅ Check 4: Scenario uniqueness")
     ids = [s['id'] for s in scenarios]
     targets = [s['target'] for s in scenarios]
-    port_sets = [tuple(sorted(s['metadata']['port_list'])) for s in scenarios]
+    port_sets = [port_tuple(s['metadata']) for s in scenarios]
     
-    dup_ids = [k for k, v in Counter(ids).items() if v > 1]
-    dup_targets = [k for k, v in Counter(targets).items() if v > 1]
-    dup_ports = [k for k, v in Counter(port_sets).items() if v > 1]
+    dup_ids = find_duplicates(ids)
+    dup_targets = find_duplicates(targets)
+    dup_ports = find_duplicates(port_sets)
     
     if dup_ids:
         print(f"   ❌ Duplicate IDs: {dup_ids}")
@@ -121,17 +167,15 @@ def validate_scenario_file(filepath: str):
     for s in scenarios:
         all_ports.update(s['metadata']['port_list'])
     
-    critical_ports = [22, 3306, 5432, 6379, 27017, 1433, 3389, 445]
-    web_ports = [80, 443, 8080, 8443, 3000]
-    custom_ports = [p for p in all_ports if p >= 4000]
+    custom_ports = sorted(p for p in all_ports if p >= 4000)
     
-    critical_used = [p for p in critical_ports if p in all_ports]
-    web_used = [p for p in web_ports if p in all_ports]
+    critical_used = sorted(CHECK7_CRITICAL_PORTS & all_ports)
+    web_used = sorted(CHECK7_WEB_PORTS & all_ports)
     
     print(f"   Total unique ports: {len(all_ports)}")
-    print(f"   Critical ports used: {len(critical_used)}/{len(critical_ports)} {critical_used}")
-    print(f"   Web ports used: {len(web_used)}/{len(web_ports)} {web_used}")
-    print(f"   Custom ports (4000+): {len(custom_ports)} {sorted(custom_ports)}")
+    print(f"   Critical ports used: {len(critical_used)}/{len(CHECK7_CRITICAL_PORTS)} {critical_used}")
+    print(f"   Web ports used: {len(web_used)}/{len(CHECK7_WEB_PORTS)} {web_used}")
+    print(f"   Custom ports (4000+): {len(custom_ports)} {custom_ports}")
     
     print("\n" + "=" * 60)
     print("✅ Validation complete!\n")
@@ -143,11 +187,15 @@ def main():
     print("🔍 Phase 1B Scenario Validation")
     print("=" * 60)
     
-    # Validate training scenarios
-    validate_scenario_file('phase1b_train.json')
+    paths = ['phase1b_train.json', 'phase1b_test.json']
+    
+    # Load both files concurrently (I/O + parse), then validate in order so output isn't interleaved
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        loaded = list(executor.map(load_scenario_file, paths))
     
-    # Validate test scenarios
-    validate_scenario_file('phase1b_test.json')
+    # Validate training scenarios, then test scenarios
+    for path, data in zip(paths, loaded):
+        validate_scenario_file(path, data)
     
     print("\n🎯 Summary:")
     print("   • Training scenarios validated")
@@ -15,21 +15,17 @@ for i, s in enumerate(env.scenarios):
         print(f"Ports: {s['metadata']['port_list']}")
         break
 
-env.reset()
-# Manually set to database cluster scenario
-env.current_scenario_idx = target_idx
-env.current_scenario = env.scenarios[target_idx]
+# Start an episode on the database cluster scenario
+env.reset(scenario_idx=target_idx)
 
-print(f"\nAfter manual set, current scenario: {env.current_scenario['id']}")
+print(f"\nAfter reset, current scenario: {env.current_scenario['id']}")
 print(f"Current ports: {env.current_scenario['metadata']['port_list']}")
 
-ports = env.current_scenario['metadata']['port_list']
-web_ports = [80, 443, 8080, 8443, 3000, 5000]
-infrastructure_ports = [22, 25, 445, 1433, 3306, 3389, 5432, 6379, 27017, 9200, 9092]
-
-has_web = any(p in web_ports for p in ports)
-has_infra = any(p in infrastructure_ports for p in ports)
-infra_count = len([p for p in ports if p in infrastructure_ports])
+# Port classification precomputed by the env at load time
+portinfo = env.current_scenario['_portinfo']
+has_web = portinfo['has_web']
+has_infra = portinfo['has_infra']
+infra_count = portinfo['infra_count']
 web_only = has_web and not has_infra
 infra_heavy = infra_count >= 2
 
@@ -5,5 +5,6 @@ Phase 1B Environments Package
 """
 
 from .full_recon_env import FullReconEnv, FullReconEnvironment
+from .batched_full_recon_env import BatchedFullReconEnv
 
-__all__ = ['FullReconEnv', 'FullReconEnvironment']
+__all__ = ['FullReconEnv', 'FullReconEnvironment', 'BatchedFullReconEnv']
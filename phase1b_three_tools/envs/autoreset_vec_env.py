@@ -0,0 +1,51 @@
+"""
+DummyVecEnv that trusts envs which auto-reset inside step()
+
+FullReconEnv(auto_reset=True) already starts the next episode on terminal
+transitions and stores the final observation in info['terminal_observation'],
+so the vec wrapper's own reset() call per episode boundary is redundant.
+Such envs advertise it as metadata['autoreset'], which gymnasium wrappers
+forward; envs without it take the normal DummyVecEnv path. Wrappers that
+require reset() between episodes (SB3's Monitor) don't fit an auto-resetting
+env; use VecMonitor around the vec env instead.
+"""
+
+from copy import deepcopy
+
+import numpy as np
+
+try:
+    from stable_baselines3.common.vec_env import DummyVecEnv
+    HAS_SB3 = True
+except ImportError:
+    HAS_SB3 = False
+
+
+def env_auto_resets(env) -> bool:
+    """Whether env (possibly wrapped) starts the next episode inside step()"""
+    return bool(env.metadata.get('autoreset', False))
+
+
+if HAS_SB3:
+    class AutoResetDummyVecEnv(DummyVecEnv):
+        """DummyVecEnv that skips reset() for envs with metadata['autoreset'] set"""
+
+        def __init__(self, env_fns):
+            super().__init__(env_fns)
+            self._auto_resets = [env_auto_resets(env) for env in self.envs]
+
+        def step_wait(self):
+            for env_idx, env in enumerate(self.envs):
+                obs, self.buf_rews[env_idx], terminated, truncated, self.buf_infos[env_idx] = env.step(
+                    self.actions[env_idx]
+                )
+                self.buf_dones[env_idx] = terminated or truncated
+                self.buf_infos[env_idx]["TimeLimit.truncated"] = truncated and not terminated
+
+                if self.buf_dones[env_idx] and not self._auto_resets[env_idx]:
+                    self.buf_infos[env_idx]["terminal_observation"] = obs
+                    obs, self.reset_infos[env_idx] = env.reset()
+                self._save_obs(env_idx, obs)
+
+            return (self._obs_from_buf(), np.copy(self.buf_rews), np.copy(self.buf_dones),
+                    deepcopy(self.buf_infos))
@@ -0,0 +1,544 @@
+"""
+PHASE 1B BATCHED ENVIRONMENT: B parallel FullReconEnv episodes in one process
+==============================================================================
+
+Same dynamics, reward (V16 discovery / completion / V17 strategic / efficiency)
+and 40-dim observation as FullReconEnv, but all episode state lives in
+shape-(B,) NumPy arrays and one step(actions) call advances every episode.
+
+Tool results are always a prefix of the scenario lists and each tool runs at
+most once per episode, so discovery state reduces to per-env counts looked up
+in per-scenario prefix tables built once at construction.
+
+API (batched, same-step autoreset like gymnasium's SAME_STEP mode):
+    obs, infos = env.reset(seed=0)                  # obs: float32[B, 40]
+    obs, rewards, terminated, truncated, infos = env.step(actions)  # actions: int[B]
+    masks = env.action_masks()                      # int8[B, 10]
+
+Finished episodes are reset inside step(); their last observation is in
+infos['final_obs'] (rows flagged by infos['_final_obs']) and their return /
+length in infos['episode'] (flagged by infos['_episode']).
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from gymnasium import spaces
+
+from .full_recon_env import (
+    ACTION_MODE, ACTION_TOOL, COMPLETION_BONUS, COMPLETION_THRESHOLDS, EFFICIENCY_BONUS,
+    EFFICIENCY_THRESHOLDS, HTTPX_TECH_DETAIL, STRATEGIC_BONUS_TABLE, STRATEGIC_BONUS_UNIT,
+    STRATEGIC_EXTRA_CONSISTENCY, STRATEGIC_EXTRA_HYBRID_SELECTIVE, STRATEGIC_EXTRA_INFRA_SERVICE,
+    STRATEGIC_EXTRA_RATE, STRATEGIC_EXTRA_WORKFLOW, STRATEGIC_HYBRID, STRATEGIC_HYBRID_NONSELECTIVE,
+    STRATEGIC_INFRA_HEAVY, FullReconEnv, HTTPX, NMAP, SKIP, SUBFINDER,
+)
+
+
+# Per-mode coverage ratio ranges and time factors (action order within each tool)
+SUBFINDER_RATIO = (np.array([0.4, 0.7, 0.95]), np.array([0.6, 0.85, 1.0]))
+SUBFINDER_TIME = np.array([0.3, 0.6, 1.0])
+HTTPX_RATIO = (np.array([0.8, 0.9, 0.95]), np.array([0.9, 0.95, 1.0]))
+HTTPX_TIME = np.array([0.4, 0.7, 1.0])
+NMAP_TIME = np.array([0.3, 0.6, 1.0])
+NMAP_VERSION_RATE = np.array([0.0, 0.5, 0.95])
+
+# Valid actions per phase (subfinder / httpx / nmap-or-skip)
+PHASE_MASKS = np.array([
+    [1, 1, 1, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 1, 1, 1, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 1, 1, 1, 1],
+], dtype=np.int8)
+PHASE_LOGIT_BIAS = np.where(PHASE_MASKS, 0.0, -1e8).astype(np.float32)  # additive policy-logit form
+
+# Base strategic bonus indexed [strategic_type, nmap mode + 1]
+STRATEGIC_BONUS = np.array(STRATEGIC_BONUS_TABLE)
+
+
+class BatchedFullReconEnv:
+    """
+    Vectorized FullReconEnv: B independent episodes advanced by one NumPy step.
+
+    Each tool runs at most once per episode, so discovery state is kept as counts
+    (subdomains, high-value, live endpoints, technologies, ports, critical services,
+    versions) rather than sets. Random draws come from one Generator for the batch,
+    so trajectories match FullReconEnv in distribution, not draw-for-draw.
+    """
+
+    metadata = {"render_modes": [], "autoreset_mode": "SameStep"}
+
+    def __init__(
+        self,
+        num_envs: int,
+        scenarios_path: str = "data/phase1b_train.json",
+        time_budget: float = 300.0,
+        max_steps: int = 3,
+        strategic_reward_scale: float = STRATEGIC_BONUS_UNIT,
+    ):
+        """
+        Initialize batched Phase 1B environment.
+
+        Args:
+            num_envs: Number of parallel episodes (B)
+            scenarios_path: Path to scenario JSON file
+            time_budget: Maximum episode duration (seconds)
+            max_steps: Maximum actions per episode (3 for 3 tools)
+            strategic_reward_scale: Value of one STRATEGIC_BONUS_UNIT (as in FullReconEnv)
+        """
+        # Reuse FullReconEnv's loader (shared scenario cache + precomputed arrays)
+        template = FullReconEnv(scenarios_path=scenarios_path, time_budget=time_budget,
+                                max_steps=max_steps)
+        self.scenarios = template.scenarios
+        self.num_scenarios = template.num_scenarios
+        self.num_envs = num_envs
+        self.time_budget = time_budget
+        self.max_steps = max_steps
+        self.strategic_reward_scale = strategic_reward_scale
+
+        self.single_observation_space = template.observation_space
+        self.single_action_space = template.action_space
+        self.observation_space = spaces.Box(low=0.0, high=1.0, shape=(num_envs, 40), dtype=np.float32)
+        self.action_space = spaces.MultiDiscrete(np.full(num_envs, 10))
+
+        self._build_scenario_tables()
+
+        self.np_random = np.random.default_rng()
+
+        # Episode state, shape (B,)
+        b = num_envs
+        self.scenario_idx = np.zeros(b, dtype=np.int32)
+        self.phase = np.zeros(b, dtype=np.int8)
+        self.step_count = np.zeros(b, dtype=np.int32)
+        self.time_elapsed = np.zeros(b, dtype=np.float64)
+        self.episode_return = np.zeros(b, dtype=np.float64)
+
+        # Tool tracking (B, 3) indexed by SUBFINDER/HTTPX/NMAP
+        self.tool_used = np.zeros((b, 3), dtype=bool)
+        self.tool_mode = np.full((b, 3), -1, dtype=np.int8)
+        self.tool_time = np.zeros((b, 3), dtype=np.float64)
+
+        # Discovery counts
+        self.n_subdomains = np.zeros(b, dtype=np.int64)
+        self.n_high_value = np.zeros(b, dtype=np.int64)
+        self.n_live = np.zeros(b, dtype=np.int64)
+        self.n_technologies = np.zeros(b, dtype=np.int64)
+        self.n_ports = np.zeros(b, dtype=np.int64)
+        self.n_critical = np.zeros(b, dtype=np.int64)
+        self.n_versions = np.zeros(b, dtype=np.int64)
+
+        # Reward breakdown columns: discovery, completion, strategic, efficiency
+        self.reward_breakdown = np.zeros((b, 4), dtype=np.float64)
+
+    def _build_scenario_tables(self):
+        """Per-scenario constants and prefix-count tables (padded to the largest scenario)"""
+        scenarios = self.scenarios
+        n = len(scenarios)
+
+        sub_counts = [len(s['tool_results']['subfinder']['subdomains']) for s in scenarios]
+        ep_counts = [len(s['tool_results']['httpx']['endpoints']) for s in scenarios]
+        svc_counts = [len(s['tool_results']['nmap']['services']) for s in scenarios]
+        max_sub, max_ep, max_svc = max(sub_counts), max(ep_counts), max(svc_counts)
+
+        self.sub_count = np.array(sub_counts, dtype=np.int64)
+        self.ep_count = np.array(ep_counts, dtype=np.int64)
+        self.svc_count = np.array(svc_counts, dtype=np.int64)
+
+        self.sub_exec_time = np.array([s['tool_results']['subfinder']['execution_time_seconds']
+                                       for s in scenarios], dtype=np.float64)
+        self.httpx_exec_time = np.array([s['tool_results']['httpx']['execution_time_seconds']
+                                         for s in scenarios], dtype=np.float64)
+        self.nmap_exec_time = np.array([s['tool_results']['nmap']['execution_time_seconds']
+                                        for s in scenarios], dtype=np.float64)
+
+        # Prefix tables: value[s, k] = count over the first k items
+        self.hv_prefix = np.zeros((n, max_sub + 1), dtype=np.int64)
+        self.tech_prefix = np.zeros((n, 3, max_ep + 1), dtype=np.int64)
+        self.port_prefix = np.zeros((n, max_svc + 1), dtype=np.int64)
+        self.web_prefix = np.zeros((n, max_svc + 1), dtype=np.int64)
+        self.critical_prefix = np.zeros((n, max_svc + 1), dtype=np.int64)
+        self.versionable = np.zeros((n, max_svc), dtype=bool)  # critical and has a version
+
+        # Scenario classification (strategic bonus) and coverage denominators
+        self.infra_class_count = np.zeros(n, dtype=np.int64)
+        self.has_infra = np.zeros(n, dtype=bool)
+        self.web_only = np.zeros(n, dtype=bool)
+        self.infra_heavy = np.zeros(n, dtype=bool)
+        self.strategic_type = np.zeros(n, dtype=np.int64)
+        self.coverage_totals = np.zeros((n, 3), dtype=np.float64)
+
+        # Observation slots that depend only on the scenario (0, 30-37, 39)
+        self.static_obs = np.zeros((n, 40), dtype=np.float64)
+
+        for i, scenario in enumerate(scenarios):
+            tool_results = scenario['tool_results']
+            metadata = scenario['metadata']
+
+            hv_mask = scenario['_hv_mask']
+            self.hv_prefix[i, 1:len(hv_mask) + 1] = np.cumsum(hv_mask)
+            self.hv_prefix[i, len(hv_mask) + 1:] = self.hv_prefix[i, len(hv_mask)]
+
+            for level, detail in enumerate(HTTPX_TECH_DETAIL):
+                techs = set()
+                for k, endpoint in enumerate(tool_results['httpx']['endpoints'], 1):
+                    if 'tech_stack' in endpoint:
+                        tech_count = int(len(endpoint['tech_stack']) * detail)
+                        techs.update(endpoint['tech_stack'][:tech_count])
+                    self.tech_prefix[i, level, k] = len(techs)
+
+            ports = scenario['_nmap_ports']
+            seen = set()
+            for k, port in enumerate(ports.tolist(), 1):
+                seen.add(port)
+                self.port_prefix[i, k] = len(seen)
+            self.web_prefix[i, 1:len(ports) + 1] = np.cumsum(scenario['_nmap_is_web'])
+            self.critical_prefix[i, 1:len(ports) + 1] = np.cumsum(scenario['_nmap_is_critical'])
+            self.versionable[i, :len(ports)] = scenario['_nmap_is_critical'] & scenario['_nmap_has_version']
+
+            portinfo = scenario['_portinfo']
+            self.has_infra[i] = portinfo['has_infra']
+            self.infra_class_count[i] = portinfo['infra_count']
+            self.web_only[i] = portinfo['web_only']
+            self.infra_heavy[i] = portinfo['infra_heavy']
+            self.strategic_type[i] = portinfo['strategic_type']
+            self.coverage_totals[i] = scenario['_coverage_totals']
+
+            obs = self.static_obs[i]
+            obs[0] = min(metadata['total_subdomains'] / 30.0, 1.0)
+            obs[30] = portinfo['has_infrastructure_ports']
+            obs[31] = portinfo['has_custom_ports']
+            obs[32] = portinfo['port_diversity']
+            obs[33] = portinfo['nmap_value']
+            obs[34] = portinfo['web_only_target']
+            obs[35] = portinfo['database_ports_found']
+            obs[36] = portinfo['admin_ports_found']
+            obs[37] = portinfo['scannable_ports']
+            obs[39] = portinfo['nmap_value'] * 0.8
+
+    def action_masks(self) -> np.ndarray:
+        """Valid action mask per env, int8[B, 10] (1=allowed, 0=blocked)"""
+        return PHASE_MASKS[self.phase]
+
+    def action_logit_bias(self) -> np.ndarray:
+        """Action masks as additive logit bias per env, float32[B, 10] (0=allowed, -1e8=blocked)"""
+        return PHASE_LOGIT_BIAS[self.phase]
+
+    def reset(
+        self,
+        seed: Optional[int] = None,
+        options: Optional[dict] = None,
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Reset all B episodes.
+
+        Args:
+            seed: Seed for the batch Generator
+            options: Unused (Gym API compatibility)
+
+        Returns:
+            observation: float32[B, 40]
+            info: {'scenario_idx': int[B]}
+        """
+        if seed is not None:
+            self.np_random = np.random.default_rng(seed)
+        self._reset_envs(np.arange(self.num_envs))
+        return self._get_observation(), {'scenario_idx': self.scenario_idx.copy()}
+
+    def simulate_fixed_actions(
+        self,
+        actions,
+        scenario_indices,
+        seed: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Play one fixed action sequence on B chosen scenarios at once (env i runs
+        scenario_indices[i]); replaces per-scenario reset/step loops in reward checks.
+
+        Args:
+            actions: Action ids applied in order to every env, e.g. (1, 4, 8)
+            scenario_indices: int[B] scenario per env
+            seed: Seed for the batch Generator
+
+        Returns:
+            float64[B] per key: 'discovery', 'completion', 'strategic', 'efficiency', 'total'
+            (each env's first episode; steps after it ends are ignored)
+        """
+        self.reset(seed=seed)
+        self.scenario_idx[:] = np.asarray(scenario_indices).reshape(self.num_envs)
+
+        breakdown = np.zeros((self.num_envs, 4), dtype=np.float64)
+        finished = np.zeros(self.num_envs, dtype=bool)
+        for action in actions:
+            _, _, terminated, truncated, infos = self.step(np.full(self.num_envs, action))
+            done = (terminated | truncated) & ~finished
+            if done.any():
+                breakdown[done] = infos['reward_breakdown'][done]
+                finished |= done
+        breakdown[~finished] = self.reward_breakdown[~finished]
+
+        columns = dict(zip(('discovery', 'completion', 'strategic', 'efficiency'), breakdown.T))
+        columns['total'] = breakdown.sum(axis=1)
+        return columns
+
+    def _reset_envs(self, idx: np.ndarray):
+        """Start new episodes for the given env indices"""
+        self.scenario_idx[idx] = self.np_random.integers(0, self.num_scenarios, size=len(idx))
+        self.phase[idx] = 0
+        self.step_count[idx] = 0
+        self.time_elapsed[idx] = 0.0
+        self.episode_return[idx] = 0.0
+        self.tool_used[idx] = False
+        self.tool_mode[idx] = -1
+        self.tool_time[idx] = 0.0
+        self.n_subdomains[idx] = 0
+        self.n_high_value[idx] = 0
+        self.n_live[idx] = 0
+        self.n_technologies[idx] = 0
+        self.n_ports[idx] = 0
+        self.n_critical[idx] = 0
+        self.n_versions[idx] = 0
+        self.reward_breakdown[idx] = 0.0
+
+    def step(self, actions) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        """
+        Advance every episode by one action.
+
+        Args:
+            actions: int[B] action per env (0-9)
+
+        Returns:
+            observation: float32[B, 40] (first observation of the next episode where one ended)
+            reward: float64[B]
+            terminated: bool[B]
+            truncated: bool[B]
+            info: final_obs/_final_obs, episode {'r', 'l'}/_episode, reward_breakdown
+                (float64[B, 4], rows valid where _episode), invalid_action
+        """
+        actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs)
+        rewards = np.zeros(self.num_envs, dtype=np.float64)
+        terminated = np.zeros(self.num_envs, dtype=bool)
+
+        # Invalid action for current phase: small penalty, terminate, no state change
+        invalid = PHASE_MASKS[self.phase, actions] == 0
+        rewards[invalid] = -10.0
+        terminated[invalid] = True
+
+        valid = ~invalid
+        self.step_count[valid] += 1
+
+        # Decode every action with one table lookup each
+        tools = ACTION_TOOL[actions]
+        modes = ACTION_MODE[actions]
+
+        self._step_subfinder(np.flatnonzero(valid & (tools == SUBFINDER)), modes, rewards)
+        self._step_httpx(np.flatnonzero(valid & (tools == HTTPX)), modes, rewards)
+
+        nmap_idx = np.flatnonzero(valid & (tools == NMAP))
+        skip_idx = np.flatnonzero(valid & (tools == SKIP))
+        self._step_nmap(nmap_idx, modes, rewards)
+
+        # Strategic bonus on episode end (nmap or skip)
+        ending = np.concatenate([nmap_idx, skip_idx])
+        if len(ending):
+            strategic = self._strategic_bonus(ending)
+            rewards[ending] += strategic
+            self.reward_breakdown[ending, 2] += strategic
+        terminated[ending] = True
+
+        # Step / time limits (checked after the action, as in FullReconEnv)
+        terminated[valid & (self.step_count >= self.max_steps)] = True
+        truncated = valid & (self.time_elapsed >= self.time_budget)
+
+        self.episode_return[valid] += rewards[valid]
+        obs = self._get_observation()
+
+        infos: Dict[str, Any] = {'invalid_action': invalid}
+        done = terminated | truncated
+        if done.any():
+            done_idx = np.flatnonzero(done)
+            infos['final_obs'] = obs.copy()
+            infos['_final_obs'] = done
+            infos['episode'] = {'r': self.episode_return.copy(), 'l': self.step_count.copy()}
+            infos['_episode'] = done
+            infos['reward_breakdown'] = self.reward_breakdown.copy()
+
+            self._reset_envs(done_idx)
+            obs[done_idx] = self._get_observation()[done_idx]
+
+        return obs, rewards, terminated, truncated, infos
+
+    def _step_subfinder(self, idx: np.ndarray, modes: np.ndarray, rewards: np.ndarray):
+        """Subfinder for envs idx: a prefix of the subdomain list per mode ratio"""
+        if not len(idx):
+            return
+        mode = modes[idx]
+        s = self.scenario_idx[idx]
+
+        ratio = self.np_random.uniform(SUBFINDER_RATIO[0][mode], SUBFINDER_RATIO[1][mode])
+        count = (self.sub_count[s] * ratio).astype(np.int64)
+        high_value = self.hv_prefix[s, count]
+
+        self.n_subdomains[idx] = np.maximum(self.n_subdomains[idx], count)
+        self.n_high_value[idx] = self.hv_prefix[s, self.n_subdomains[idx]]
+        self._record_tool(idx, SUBFINDER, mode, self.sub_exec_time[s] * SUBFINDER_TIME[mode])
+        self.phase[idx] = 1
+
+        discovery = count * 43.0 + high_value * 95.0
+        rewards[idx] += discovery
+        self.reward_breakdown[idx, 0] += discovery
+
+    def _step_httpx(self, idx: np.ndarray, modes: np.ndarray, rewards: np.ndarray):
+        """HTTPX for envs idx: a prefix of the endpoint list, tech detail per mode"""
+        if not len(idx):
+            return
+        mode = modes[idx]
+        s = self.scenario_idx[idx]
+
+        ratio = self.np_random.uniform(HTTPX_RATIO[0][mode], HTTPX_RATIO[1][mode])
+        count = (self.ep_count[s] * ratio).astype(np.int64)
+
+        self.n_live[idx] = np.maximum(self.n_live[idx], count)
+        self.n_technologies[idx] = np.maximum(self.n_technologies[idx], self.tech_prefix[s, mode, count])
+        self._record_tool(idx, HTTPX, mode, self.httpx_exec_time[s] * HTTPX_TIME[mode])
+        self.phase[idx] = 2
+
+        discovery = count * 32.0 + self.n_technologies[idx] * 22.0
+        rewards[idx] += discovery
+        self.reward_breakdown[idx, 0] += discovery
+
+    def _step_nmap(self, idx: np.ndarray, modes: np.ndarray, rewards: np.ndarray):
+        """Nmap for envs idx: service prefix per mode, vectorized version draws, completion/efficiency"""
+        if not len(idx):
+            return
+        mode = modes[idx]
+        s = self.scenario_idx[idx]
+
+        svc = self.svc_count[s]
+        count = np.where(mode == 0, np.minimum(svc, (svc * 0.6).astype(np.int64)),
+                         np.where(mode == 1, (svc * 0.9).astype(np.int64), svc))
+
+        web = self.web_prefix[s, count]
+        critical = self.critical_prefix[s, count]
+        self.n_ports[idx] = self.port_prefix[s, count]
+        self.n_critical[idx] = critical
+
+        # Versions: one draw per (env, service); quick mode has rate 0
+        width = self.versionable.shape[1]
+        in_scan = np.arange(width) < count[:, None]
+        draws = self.np_random.random((len(idx), width)) < NMAP_VERSION_RATE[mode][:, None]
+        self.n_versions[idx] = np.count_nonzero(draws & in_scan & self.versionable[s], axis=1)
+
+        self._record_tool(idx, NMAP, mode, self.nmap_exec_time[s] * NMAP_TIME[mode])
+
+        discovery = web * 22.0 + (count - web) * 65.0 + critical * 125.0 + self.n_versions[idx] * 60.0
+        rewards[idx] += discovery
+        self.reward_breakdown[idx, 0] += discovery
+
+        # Completion bonus from coverage
+        coverage = self._coverage(idx)
+        completion = COMPLETION_BONUS[np.searchsorted(COMPLETION_THRESHOLDS, coverage, side='left')]
+        rewards[idx] += completion
+        self.reward_breakdown[idx, 1] += completion
+
+        # Efficiency bonus from total time
+        efficiency = EFFICIENCY_BONUS[np.searchsorted(EFFICIENCY_THRESHOLDS, self.time_elapsed[idx], side='right')]
+        rewards[idx] += efficiency
+        self.reward_breakdown[idx, 3] += efficiency
+
+    def _record_tool(self, idx: np.ndarray, tool_id: int, mode: np.ndarray, time_taken: np.ndarray):
+        """Mark tool used for envs idx and advance their clocks"""
+        self.tool_used[idx, tool_id] = True
+        self.tool_mode[idx, tool_id] = mode
+        self.tool_time[idx, tool_id] = time_taken
+        self.time_elapsed[idx] += time_taken
+
+    def _coverage(self, idx: np.ndarray) -> np.ndarray:
+        """Discovery coverage (0-1) for envs idx"""
+        totals = self.coverage_totals[self.scenario_idx[idx]]
+        coverage = (self.n_subdomains[idx] / totals[:, 0] * 0.4 +
+                    self.n_live[idx] / totals[:, 1] * 0.3 +
+                    self.n_ports[idx] / totals[:, 2] * 0.3)
+        return np.minimum(coverage, 1.0)
+
+    def _strategic_bonus(self, idx: np.ndarray) -> np.ndarray:
+        """V17 strategic bonus (FullReconEnv._calculate_strategic_bonus) for envs idx"""
+        s = self.scenario_idx[idx]
+        scenario_type = self.strategic_type[s]
+        infra_heavy = scenario_type == STRATEGIC_INFRA_HEAVY
+
+        nmap_used = self.tool_used[idx, NMAP]
+        nmap_outcome = self.tool_mode[idx, NMAP] + 1  # 0=skipped, 1=quick, 2=full, 3=service
+        service = nmap_outcome == 3
+
+        n_sub = self.n_subdomains[idx]
+        n_hv = self.n_high_value[idx]
+        selective = (n_hv > 0) & (n_sub > 0)
+        ratio = n_hv / np.maximum(n_sub, 1)
+
+        # Base bonus per (scenario type, nmap outcome)
+        bonus = STRATEGIC_BONUS[scenario_type, nmap_outcome]
+
+        # Infra heavy: complex target with service mode, 3-tool workflow completion
+        bonus += np.where(infra_heavy & service & (self.infra_class_count[s] >= 3),
+                          STRATEGIC_EXTRA_INFRA_SERVICE, 0.0)
+        bonus += np.where(infra_heavy & self.tool_used[idx].all(axis=1), STRATEGIC_EXTRA_WORKFLOW, 0.0)
+
+        # Hybrid with nmap: selective service scan +1350, non-selective flat 1800
+        hybrid_nmap = (scenario_type == STRATEGIC_HYBRID) & nmap_used
+        bonus += np.where(hybrid_nmap & selective & service & (ratio > 0.3),
+                          STRATEGIC_EXTRA_HYBRID_SELECTIVE, 0.0)
+        bonus = np.where(hybrid_nmap & ~selective, STRATEGIC_HYBRID_NONSELECTIVE, bonus)
+
+        # Efficiency and consistency (only if nmap used)
+        finds_per_second = n_sub / np.maximum(self.time_elapsed[idx], 1)
+        efficient = nmap_used & (n_sub > 0)
+        bonus += np.where(efficient & (finds_per_second > 1.0), STRATEGIC_EXTRA_RATE, 0.0)
+        consistent = efficient & (n_sub > 8) & (self.n_live[idx] > 5) & (self.n_ports[idx] > 2)
+        bonus += np.where(consistent, STRATEGIC_EXTRA_CONSISTENCY, 0.0)
+
+        return bonus * (self.strategic_reward_scale / STRATEGIC_BONUS_UNIT)
+
+    def _get_observation(self) -> np.ndarray:
+        """Build float32[B, 40] observations (same layout as FullReconEnv)"""
+        b = np.arange(self.num_envs)
+        obs = self.static_obs[self.scenario_idx].copy()
+
+        n_sub = self.n_subdomains
+        n_live = self.n_live
+
+        # Ratios are written raw and capped at 1.0 by one np.minimum over the whole slab;
+        # every other slot (flags, one-hots, phase, coverage, static port context) is
+        # already <= 1 except httpx_accuracy (29), which is uncapped and written last.
+
+        # Group 1: Target Characteristics (0 and 3 set below / statically)
+        obs[:, 1] = n_sub / 30.0
+        obs[:, 2] = n_live / 25.0
+        obs[:, 3] = self._coverage(b)
+        obs[:, 4] = self.time_elapsed / self.time_budget
+        obs[:, 5] = self.n_high_value > 0
+        obs[:, 6] = self.phase / 2.0
+        obs[:, 7] = self.step_count / self.max_steps
+
+        # Group 2: Tool Usage History — one-hot (tool, mode) at 8 + 3*tool + mode
+        env_idx, tool_idx = np.nonzero(self.tool_used)
+        obs[env_idx, 8 + 3 * tool_idx + self.tool_mode[env_idx, tool_idx]] = 1.0
+        obs[:, 17] = np.count_nonzero(self.tool_used, axis=1) / 3.0
+        obs[:, 18] = self.tool_time[:, SUBFINDER] / 60.0
+        obs[:, 19] = self.tool_time[:, HTTPX] / 120.0
+
+        # Group 3: Discovery Metrics
+        obs[:, 20] = n_sub / 30.0
+        obs[:, 21] = self.n_high_value / 10.0
+        obs[:, 22] = n_live / 25.0
+        obs[:, 23] = self.n_technologies / 10.0
+        obs[:, 24] = self.n_ports / 20.0
+        obs[:, 25] = self.n_critical / 10.0
+        obs[:, 26] = self.n_versions / 10.0
+        obs[:, 27] = n_sub / np.maximum(self.time_elapsed, 1) / 5.0
+        obs[:, 28] = self.n_high_value / np.maximum(n_sub, 1)
+
+        # Group 4: Nmap-Specific Context (static except nmap_time)
+        obs[:, 38] = self.tool_time[:, NMAP] / 300.0
+
+        np.minimum(obs, 1.0, out=obs)
+        obs[:, 29] = n_live / np.maximum(n_sub, 1)
+
+        return obs.astype(np.float32)
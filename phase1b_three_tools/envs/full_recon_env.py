@@ -37,8 +37,269 @@ from gymnasium import spaces
 import numpy as np
 from typing import Dict, List, Tuple, Any, Optional
 import json
+import mmap
+import pickle
+import re
+from itertools import compress
 from pathlib import Path
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in so reward_core / fill_observation run as plain Python"""
+        return lambda func: func
+
+
+# Port classes used by nmap discovery and reward (sorted arrays for np.isin)
+CRITICAL_PORTS_ARR = np.array([22, 25, 445, 1433, 3306, 3389, 5432, 6379, 27017], dtype=np.int32)
+WEB_PORTS_ARR = np.array([80, 443, 3000, 5000, 8080, 8443], dtype=np.int32)
+
+# Port classes behind scenario['_portinfo'] (strategic bonus and observation use slightly different lists)
+STRATEGIC_WEB_PORTS = frozenset({80, 443, 8080, 8443, 3000, 5000})
+STRATEGIC_INFRA_PORTS = frozenset({22, 25, 445, 1433, 3306, 3389, 5432, 6379, 27017, 9200, 9092})
+OBS_INFRA_PORTS = frozenset({22, 25, 445, 1433, 3306, 3389, 5432, 6379, 27017})
+OBS_WEB_PORTS = frozenset({80, 443, 8080, 8443, 3000})
+OBS_DB_PORTS = frozenset({3306, 5432, 6379, 27017})
+OBS_ADMIN_PORTS = frozenset({8443, 9090, 9000})
+
+# Scenario port lists are packed into an int bitmask at load time (one bit per port in the
+# classes above, plus catch-all bits for any other port below / at-or-above 4000, the custom
+# port cutoff); each class test is then an AND against the class mask.
+PORT_INDEX = {port: bit for bit, port in enumerate(sorted(
+    STRATEGIC_WEB_PORTS | STRATEGIC_INFRA_PORTS | OBS_INFRA_PORTS | OBS_WEB_PORTS |
+    OBS_DB_PORTS | OBS_ADMIN_PORTS))}
+OTHER_PORT_BIT = 1 << len(PORT_INDEX)
+OTHER_CUSTOM_PORT_BIT = 1 << (len(PORT_INDEX) + 1)
+
+
+def port_bits(ports) -> int:
+    """Pack ports into a PORT_INDEX bitmask (unlisted ports set a catch-all bit)"""
+    bits = 0
+    for port in ports:
+        bit = PORT_INDEX.get(port)
+        if bit is not None:
+            bits |= 1 << bit
+        else:
+            bits |= OTHER_CUSTOM_PORT_BIT if port >= 4000 else OTHER_PORT_BIT
+    return bits
+
+
+STRATEGIC_WEB_MASK = port_bits(STRATEGIC_WEB_PORTS)
+STRATEGIC_INFRA_MASK = port_bits(STRATEGIC_INFRA_PORTS)
+OBS_INFRA_MASK = port_bits(OBS_INFRA_PORTS)
+OBS_WEB_MASK = port_bits(OBS_WEB_PORTS)
+OBS_DB_MASK = port_bits(OBS_DB_PORTS)
+OBS_ADMIN_MASK = port_bits(OBS_ADMIN_PORTS)
+CUSTOM_PORT_MASK = port_bits(port for port in PORT_INDEX if port >= 4000) | OTHER_CUSTOM_PORT_BIT
+
+
+# Strategic scenario types (scenario['_portinfo']['strategic_type']) and base bonus per
+# (type, nmap outcome); outcome = nmap mode + 1, i.e. 0=skipped, 1=quick, 2=full, 3=service.
+# Conditional extras (STRATEGIC_EXTRA_* below: infra_count >= 3, hybrid selectivity, 3-tool
+# workflow, efficiency, consistency) are applied in _calculate_strategic_bonus.
+STRATEGIC_INFRA_HEAVY, STRATEGIC_WEB_ONLY, STRATEGIC_HYBRID, STRATEGIC_OTHER = 0, 1, 2, 3
+STRATEGIC_BONUS_TABLE = (
+    (-1200.0, 1800.0, 3600.0, 4500.0),  # infra heavy: force nmap, service mode optimal
+    (800.0, 240.0, -200.0, -200.0),     # web only: smart skip optimal, heavy scans wasteful
+    (-800.0, 1350.0, 0.0, 2250.0),      # hybrid with selective subfinder (non-selective: 1800)
+    (0.0, 0.0, 0.0, 0.0),               # no infrastructure ports, not web-only
+)
+STRATEGIC_EXTRA_INFRA_SERVICE = 1200.0     # infra heavy, service mode, infra_count >= 3
+STRATEGIC_EXTRA_WORKFLOW = 5200.0          # infra heavy, all three tools used
+STRATEGIC_EXTRA_HYBRID_SELECTIVE = 1350.0  # hybrid, service mode, high-value ratio > 0.3
+STRATEGIC_HYBRID_NONSELECTIVE = 1800.0     # hybrid with nmap, no high-value finds: replaces base
+STRATEGIC_EXTRA_RATE = 432.0               # nmap used, > 1 subdomain per second
+STRATEGIC_EXTRA_CONSISTENCY = 750.0        # nmap used, > 8 subdomains / 5 endpoints / 2 ports
+# The terms above are in V17 points; the total is multiplied by
+# strategic_reward_scale / STRATEGIC_BONUS_UNIT (the largest single term), so the default
+# scale keeps V17 magnitudes and strategic_reward_scale=1.0 gives unit-scale bonuses.
+STRATEGIC_BONUS_UNIT = 5200.0
+
+
+# Parsed + precomputed scenarios shared by every env in this process: (path, mtime_ns) -> list.
+# Bump SCENARIO_CACHE_VERSION whenever _precompute_scenario changes (invalidates .cache.pkl files).
+SCENARIO_CACHE_VERSION = 7
+_SCENARIO_CACHE = {}
+
+
+# Tool ids (reward_core, tool-tracking arrays) and per-tool mode names (action order)
+SUBFINDER, HTTPX, NMAP, SKIP = 0, 1, 2, 3
+TOOL_IDS = {'subfinder': SUBFINDER, 'httpx': HTTPX, 'nmap': NMAP, 'skip': SKIP}
+TOOL_MODES = (
+    ('passive', 'active', 'comprehensive'),
+    ('basic', 'thorough', 'comprehensive'),
+    ('quick', 'full', 'service'),
+)
+# Int mode ids (index into TOOL_MODES[tool], = action - 3 * tool); names only appear in results/logs
+MODE_PASSIVE, MODE_ACTIVE, MODE_COMPREHENSIVE = 0, 1, 2
+MODE_BASIC, MODE_THOROUGH, MODE_HX_COMPREHENSIVE = 0, 1, 2
+MODE_QUICK, MODE_FULL, MODE_SERVICE = 0, 1, 2
+# Action id -> tool id / mode id (skip has no mode: -1), for decoding action arrays in one lookup
+ACTION_TOOL = np.array([SUBFINDER] * 3 + [HTTPX] * 3 + [NMAP] * 3 + [SKIP], dtype=np.int64)
+ACTION_MODE = np.array([0, 1, 2] * 3 + [-1], dtype=np.int64)
+
+# Share of each endpoint's tech_stack httpx reports per mode (basic / thorough / comprehensive)
+HTTPX_TECH_DETAIL = (0.5, 0.8, 1.0)
+
+
+# Step-function bonuses after nmap, looked up with np.searchsorted instead of if/elif chains.
+# Completion: coverage strictly above a threshold earns its tier (0.5 -> 180 ... 0.8 -> 540).
+COMPLETION_THRESHOLDS = np.array([0.5, 0.6, 0.7, 0.8])
+COMPLETION_BONUS = np.array([0.0, 180.0, 270.0, 360.0, 540.0])  # AMPLIFIED 1.8x (100/150/200/300)
+# Efficiency: total time strictly below a threshold earns its tier (< 90 -> 227 ... >= 180 -> 0).
+EFFICIENCY_THRESHOLDS = np.array([90.0, 120.0, 180.0])
+EFFICIENCY_BONUS = np.array([227.0, 60.0, 30.0, 0.0])
+
+INV_3 = 1.0 / 3.0  # total_tools_used normalization (3 tools)
+
+
+@njit(cache=True)
+def reward_core(tool_id, subdomains_found, high_value_found, live_found, tech_found,
+                web_port_count, infra_port_count, critical_services, versions,
+                n_subdomains, n_live, n_ports, total_subdomains, total_live, total_ports,
+                time_elapsed):
+    """
+    Numeric core of the V2 reward (discovery, completion, efficiency).
+    
+    n_* are the episode's discovered counts and total_* the scenario's coverage
+    denominators (already clamped to >= 1); coverage is only computed after nmap.
+    Strategic bonus depends on scenario metadata and stays in Python.
+    Returns (discovery, completion, efficiency) as floats.
+    """
+    discovery = 0.0
+    completion = 0.0
+    efficiency = 0.0
+    
+    # Component 1: Discovery Rewards - V16 ULTIMATE (V13 EXACT + high-value amplification)
+    if tool_id == 0:
+        discovery += subdomains_found * 43  # V13 EXACT value - proven optimal
+        discovery += high_value_found * 95  # BOOST high-value for quality focus
+    elif tool_id == 1:
+        discovery += live_found * 32  # V13 EXACT - proven optimal
+        discovery += tech_found * 22  # V13 EXACT - proven optimal
+    elif tool_id == 2:
+        # CONDITIONAL REWARDS - V16 ULTIMATE (V13 base + SERVICE AMPLIFICATION)
+        # V13 EXACT for ports, BOOST for services (key differentiator!)
+        discovery += web_port_count * 22  # V13 EXACT
+        discovery += infra_port_count * 65  # V13 EXACT
+        discovery += critical_services * 125  # BOOSTED! Services are gold!
+        discovery += versions * 60  # BOOSTED! Version detection valuable!
+    # Skip nmap = 0 discovery reward (strategic bonus decides if it was right)
+    
+    if tool_id == 2:
+        # Discovery coverage (0-1), same weighting as obs[3] in fill_observation
+        coverage = min(n_subdomains / total_subdomains * 0.4 +
+                       n_live / total_live * 0.3 +
+                       n_ports / total_ports * 0.3, 1.0)
+        
+        # Component 2: Completion Bonus - AMPLIFIED 1.8x (ONLY after nmap - force 3-tool workflow!)
+        completion = float(COMPLETION_BONUS[np.searchsorted(COMPLETION_THRESHOLDS, coverage, side='left')])
+        
+        # Component 4: Efficiency Bonus - V15 HYBRID (V13 base: 216, slight boost), NO TIME PENALTY!
+        efficiency = float(EFFICIENCY_BONUS[np.searchsorted(EFFICIENCY_THRESHOLDS, time_elapsed, side='right')])
+    
+    return discovery, completion, efficiency
+
+
+# Warm up at import so the first step() doesn't pay for it (loaded from numba's disk cache
+# after the first run; no-op cost without numba)
+reward_core(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 0.0)
+
+
+@njit(cache=True)
+def fill_observation(obs, n_subdomains, n_high_value, n_live, n_ports, n_technologies,
+                     n_critical, n_versions, n_tools, time_elapsed, time_budget, current_phase,
+                     step_count, max_steps_inv, tool_used, tool_mode, tool_time,
+                     total_subdomains, total_live, total_ports, obs_ports, nmap_value):
+    """
+    Numeric core of _get_observation: writes all 40 slots of obs in place.
+    
+    Counts come in as ints (mask reductions stay in NumPy); tool_used / tool_mode /
+    tool_time are the SoA tool arrays, obs_ports the scenario's static slots 30-37,
+    max_steps_inv is 1 / max_steps.
+    """
+    subdomain_count = min(n_subdomains / 30.0, 1.0)
+    live_count = min(n_live / 25.0, 1.0)
+    coverage = (n_subdomains / max(total_subdomains, 1) * 0.4 +
+                n_live / max(total_live, 1) * 0.3 +
+                n_ports / max(total_ports, 1) * 0.3)
+    
+    # Group 1: Target Characteristics (8 dims)
+    obs[0] = min(total_subdomains / 30.0, 1.0)  # domain_complexity
+    obs[1] = subdomain_count  # subdomain_count
+    obs[2] = live_count  # live_endpoint_count
+    obs[3] = min(coverage, 1.0)  # scan_coverage
+    obs[4] = min(time_elapsed / time_budget, 1.0)  # time_elapsed
+    obs[5] = 1.0 if n_high_value > 0 else 0.0  # critical_found
+    obs[6] = current_phase / 2.0  # current_phase (0/1/2 → 0/0.5/1.0)
+    obs[7] = step_count * max_steps_inv  # phase_progress
+    
+    # Group 2: Tool Usage History (12 dims)
+    # [8-16] one-hot (tool, mode) per used tool: 8 + 3*tool + mode
+    for tool_id in range(3):
+        for mode in range(3):
+            obs[8 + 3 * tool_id + mode] = 0.0
+        if tool_used[tool_id]:
+            obs[8 + 3 * tool_id + tool_mode[tool_id]] = 1.0
+    obs[17] = n_tools * INV_3  # total_tools_used
+    obs[18] = min(tool_time[0] / 60.0, 1.0)  # subfinder_time
+    obs[19] = min(tool_time[1] / 120.0, 1.0)  # httpx_time
+    
+    # Group 3: Discovery Metrics (10 dims)
+    obs[20] = subdomain_count  # total_subdomains
+    obs[21] = min(n_high_value / 10.0, 1.0)  # high_value_subdomains
+    obs[22] = live_count  # live_endpoints
+    obs[23] = min(n_technologies / 10.0, 1.0)  # technologies_found
+    obs[24] = min(n_ports / 20.0, 1.0)  # open_ports
+    obs[25] = min(n_critical / 10.0, 1.0)  # critical_services
+    obs[26] = min(n_versions / 10.0, 1.0)  # service_versions
+    obs[27] = min(n_subdomains / max(time_elapsed, 1.0) / 5.0, 1.0)  # discovery_rate
+    obs[28] = n_high_value / max(n_subdomains, 1)  # high_value_ratio
+    obs[29] = n_live / max(n_subdomains, 1)  # httpx_accuracy
+    
+    # Group 4: Nmap-Specific Context (10 dims; port classes precomputed at load time)
+    # [30-37] has_infrastructure_ports, has_custom_ports, port_diversity, nmap_value_estimate,
+    #         web_only_target, database_ports_found, admin_ports_found, scannable_ports
+    for i in range(8):
+        obs[30 + i] = obs_ports[i]
+    obs[38] = min(tool_time[2] / 300.0, 1.0)  # nmap_time
+    obs[39] = nmap_value * 0.8  # nmap_expected_value (slightly lower than estimate)
+
+
+fill_observation(np.zeros(40, dtype=np.float32), 0, 0, 0, 0, 0, 0, 0, 0, 0.0, 1.0, 0, 0, 1.0,
+                 np.zeros(3, dtype=bool), np.full(3, -1, dtype=np.int8), np.zeros(3),
+                 0, 0, 0, np.zeros(8, dtype=np.float32), 0.0)
+
+
+class _MidpointDraws:
+    """
+    Deterministic stand-in for np_random used to build the expected-reward table:
+    uniform() returns the midpoint, random() never detects a version (added analytically),
+    integers() picks the scenario being evaluated.
+    """
+    
+    def __init__(self, scenario_idx: int):
+        self.scenario_idx = scenario_idx
+    
+    def uniform(self, low, high):
+        return (low + high) / 2
+    
+    def random(self, size):
+        return np.ones(size)
+    
+    def integers(self, low, high=None):
+        return self.scenario_idx
+
 
 class FullReconEnv(gym.Env):
     """
@@ -176,12 +437,56 @@ class FullReconEnv(gym.Env):
     
     metadata = {"render_modes": ["human"], "render_fps": 1}
     
+    # Instance state as slots (descriptor reads instead of dict probes on the step path).
+    # gym.Env has no __slots__, so instances keep a __dict__ for anything not listed here
+    # (gym's own fields, per-instance metadata, attributes scripts attach).
+    __slots__ = (
+        # Configuration and scenario data
+        'scenarios_path', 'time_budget', 'max_steps', 'render_mode', 'scenarios', 'num_scenarios',
+        '_time_budget', '_max_steps_inv', '_auto_reset', '_potential_shaping', '_shaping_gamma',
+        '_copy_obs', '_obs_out', '_obs_scale',
+        'strategic_reward_scale',
+        'observation_space', 'action_space', 'action_names', '_action_table', '_hv_keywords', '_hv_re',
+        # Episode state
+        'current_scenario', 'current_scenario_idx', 'current_phase', 'step_count', 'current_step',
+        'time_elapsed', 'terminated', 'truncated',
+        '_tool_used', '_tool_time', '_tool_mode', '_tool_results', '_tools_used_count',
+        'discovered', '_counts',
+        # Reward tracking and reusable buffers
+        'total_reward', 'cumulative_reward', 'reward_breakdown', '_obs', '_info_scratch',
+        '_info_base_len',
+        '_expected_reward', '_expected_return', '_return_to_go',
+    )
+    
+    # Action masks per phase (sequential workflow); read-only class constants shared with callers
+    _PHASE_MASKS = np.array([
+        [1, 1, 1, 0, 0, 0, 0, 0, 0, 0],  # subfinder: 0-2
+        [0, 0, 0, 1, 1, 1, 0, 0, 0, 0],  # httpx: 3-5
+        [0, 0, 0, 0, 0, 0, 1, 1, 1, 1],  # nmap: 6-8 or skip (9)
+    ], dtype=np.int8)
+    # Same masks as additive logit bias (0 allowed, -1e8 blocked = sb3_contrib's masking value)
+    _PHASE_LOGIT_BIAS = np.where(_PHASE_MASKS, 0.0, -1e8).astype(np.float32)
+    # Valid action indices per phase, for sampling without scanning the mask
+    _PHASE_VALID = tuple(np.flatnonzero(mask) for mask in _PHASE_MASKS)
+    for _table in (_PHASE_MASKS, _PHASE_LOGIT_BIAS) + _PHASE_VALID:
+        _table.setflags(write=False)
+    # Per-phase row views, so action_masks() hands out the same object without re-slicing
+    _PHASE_MASK_ROWS = tuple(_PHASE_MASKS)
+    _PHASE_LOGIT_BIAS_ROWS = tuple(_PHASE_LOGIT_BIAS)
+    del _table
+    
     def __init__(
         self,
         scenarios_path: str = "data/phase1b_train.json",
         time_budget: float = 300.0,  # 5 min for 3 tools
         max_steps: int = 3,  # Subfinder + HTTPX + Nmap
         render_mode: Optional[str] = None,
+        auto_reset: bool = False,
+        potential_shaping: bool = False,
+        shaping_gamma: float = 0.99,
+        strategic_reward_scale: float = STRATEGIC_BONUS_UNIT,
+        copy_obs: bool = False,
+        obs_dtype=np.float32,
     ):
         """
         Initialize Phase 1B environment.
@@ -191,22 +496,55 @@ class FullReconEnv(gym.Env):
             time_budget: Maximum episode duration (seconds)
             max_steps: Maximum actions per episode (3 for 3 tools)
             render_mode: Rendering mode for visualization
+            auto_reset: Start the next episode inside step() on terminal transitions
+                (final observation goes to info['terminal_observation'])
+            potential_shaping: Add potential-based shaping gamma*Phi(s') - Phi(s) to every
+                step reward (see _potential; leaves the optimal policy unchanged)
+            shaping_gamma: Discount used in the shaping term (match the agent's gamma)
+            strategic_reward_scale: Value of one STRATEGIC_BONUS_UNIT of strategic bonus
+                (default keeps the V17 magnitudes; 1.0 maps them to about [-0.25, 2.5])
+            copy_obs: Return a fresh array from every reset()/step(). By default non-terminal
+                observations are the same internal buffer, overwritten by the next call;
+                terminal observations are always returned as copies, so SB3 / gymnasium vec
+                envs that stash them in info before calling reset() are safe. Callers that keep
+                non-terminal observations across calls (replay storage) need copy_obs=True
+            obs_dtype: Observation dtype: float32 (default), float16 (half the bytes per
+                observation, e.g. over AsyncVectorEnv IPC), or uint8 (values quantized to
+                round(x * 255) in [0, 255]; divide by 255 on the learner side)
         """
         super().__init__()
         
         self.scenarios_path = Path(scenarios_path)
         self.time_budget = time_budget
         self.max_steps = max_steps
+        self._time_budget = float(time_budget)
+        self._max_steps_inv = 1.0 / max_steps
         self.render_mode = render_mode
-        
-        # State space: 40 dimensions (continuous)
+        self._auto_reset = auto_reset
+        self._potential_shaping = potential_shaping
+        self._shaping_gamma = shaping_gamma
+        self.strategic_reward_scale = strategic_reward_scale
+        self._copy_obs = copy_obs
+        if auto_reset:
+            self.metadata = {**self.metadata, "autoreset": True}
+        
+        # State space: 40 dimensions (continuous; uint8 = quantized to 0-255)
+        obs_dtype = np.dtype(obs_dtype)
+        if obs_dtype not in (np.float32, np.float16, np.uint8):
+            raise ValueError(f"obs_dtype must be float32, float16 or uint8, got {obs_dtype}")
         self.observation_space = spaces.Box(
-            low=0.0,
-            high=1.0,
+            low=0,
+            high=255 if obs_dtype == np.uint8 else 1.0,
             shape=(40,),
-            dtype=np.float32
+            dtype=obs_dtype
         )
         
+        # Observation buffer, filled in place by _get_observation() (always float32; other
+        # dtypes are converted into _obs_out, scaled by _obs_scale for uint8)
+        self._obs = np.zeros(40, dtype=np.float32)
+        self._obs_out = None if obs_dtype == np.float32 else np.zeros(40, dtype=obs_dtype)
+        self._obs_scale = 255.0 if obs_dtype == np.uint8 else None
+        
         # Action space: 10 discrete actions (3 tools × 3 modes + SKIP)
         self.action_space = spaces.Discrete(10)
         
@@ -224,6 +562,27 @@ class FullReconEnv(gym.Env):
             "skip_nmap",              # 9 - TERMINATE without nmap (conditional!)
         ]
         
+        # Action routing: (tool, tool_id, mode id, handler, next_phase, terminates)
+        self._action_table = (
+            ('subfinder', SUBFINDER, MODE_PASSIVE, self._execute_subfinder, 1, False),        # 0
+            ('subfinder', SUBFINDER, MODE_ACTIVE, self._execute_subfinder, 1, False),         # 1
+            ('subfinder', SUBFINDER, MODE_COMPREHENSIVE, self._execute_subfinder, 1, False),  # 2
+            ('httpx', HTTPX, MODE_BASIC, self._execute_httpx, 2, False),                      # 3
+            ('httpx', HTTPX, MODE_THOROUGH, self._execute_httpx, 2, False),                   # 4
+            ('httpx', HTTPX, MODE_HX_COMPREHENSIVE, self._execute_httpx, 2, False),           # 5
+            ('nmap', NMAP, MODE_QUICK, self._execute_nmap, 2, True),                          # 6
+            ('nmap', NMAP, MODE_FULL, self._execute_nmap, 2, True),                           # 7
+            ('nmap', NMAP, MODE_SERVICE, self._execute_nmap, 2, True),                        # 8
+            ('skip', SKIP, -1, None, 2, True),                                                # 9
+        )
+        
+        # High-value subdomain keywords (lowercase, matched as substrings)
+        self._hv_keywords = ('admin', 'api', 'db', 'database', 'mysql', 'postgres',
+                             'redis', 'mail', 'smtp', 'vpn', 'backup', 'panel')
+        # One case-insensitive alternation instead of a substring check per keyword
+        self._hv_re = re.compile('|'.join(re.escape(kw) for kw in self._hv_keywords),
+                                 re.IGNORECASE)
+        
         # Load scenarios
         self._load_scenarios()
         
@@ -238,23 +597,32 @@ class FullReconEnv(gym.Env):
         self.terminated = False
         self.truncated = False
         
-        # Tool results tracking
-        self.tools_used = {
-            'subfinder': {'used': False, 'mode': None, 'time': 0, 'results': {}},
-            'httpx': {'used': False, 'mode': None, 'time': 0, 'results': {}},
-            'nmap': {'used': False, 'mode': None, 'time': 0, 'results': {}},
-        }
-        
-        # Discovery tracking
+        # Tool results tracking (SoA, indexed by SUBFINDER/HTTPX/NMAP; see tools_used property)
+        self._tool_used = np.zeros(3, dtype=bool)
+        self._tool_time = np.zeros(3, dtype=np.float64)
+        self._tool_mode = np.full(3, -1, dtype=np.int8)  # index into TOOL_MODES[tool]
+        self._tool_results = [None, None, None]  # last results dict per tool (None = not run)
+        self._tools_used_count = 0  # number of True entries in _tool_used
+        
+        # Discovery tracking (positional masks over the scenario's lists, sized for the
+        # largest scenario; allocated once and cleared in place by reset())
+        max_subdomains = max(len(s['tool_results']['subfinder']['subdomains']) for s in self.scenarios)
+        max_endpoints = max(len(s['tool_results']['httpx']['endpoints']) for s in self.scenarios)
+        num_technologies = max((int(ids.max()) + 1 for s in self.scenarios for ids in s['_tech_ids']
+                                if ids.size), default=0)
+        max_port = max((int(s['_nmap_ports'].max()) for s in self.scenarios if s['_nmap_ports'].size),
+                       default=0)
         self.discovered = {
-            'subdomains': set(),
-            'high_value_subdomains': set(),
-            'live_endpoints': set(),
-            'technologies': set(),
-            'open_ports': set(),
+            'subdomains_mask': np.zeros(max_subdomains, dtype=bool),
+            'high_value_mask': np.zeros(max_subdomains, dtype=bool),
+            'live_endpoints_mask': np.zeros(max_endpoints, dtype=bool),
+            'technologies_mask': np.zeros(num_technologies, dtype=bool),  # by technology ID
+            'ports_mask': np.zeros(max_port + 1, dtype=bool),  # by port number
             'critical_services': set(),
             'service_versions': {},
         }
+        # Discovered-item count per mask, refreshed by _add_discovery (read via _found)
+        self._counts = {key: 0 for key, value in self.discovered.items() if key.endswith('_mask')}
         
         # Reward tracking
         self.total_reward = 0.0
@@ -264,62 +632,333 @@ class FullReconEnv(gym.Env):
             'strategic': 0.0,
             'efficiency': 0.0,
         }
+        if potential_shaping:
+            self.reward_breakdown['shaping'] = 0.0
+        
+        # Reusable step() info payload (mutated in place; valid until the next step)
+        self._info_scratch = {
+            'step': 0,
+            'action': '',
+            'phase': '',
+            'time_elapsed': 0.0,
+            'reward_breakdown': self.reward_breakdown,
+            'total_reward': 0.0,
+            'action_masks': None,
+        }
+        self._info_base_len = len(self._info_scratch)
+        
+        # Expected reward per (scenario, phase, action); built on first use, see expected_reward_table()
+        self._expected_reward = None
+        self._expected_return = None
+        self._return_to_go = None
         
     def _load_scenarios(self):
-        """Load scenarios from JSON file"""
+        """
+        Load scenarios from JSON file.
+        
+        Parsed, precomputed scenarios are cached in-process (shared, read-only across envs)
+        and on disk next to the JSON as <name>.cache.pkl, both keyed by the JSON mtime.
+        """
         if not self.scenarios_path.exists():
             raise FileNotFoundError(f"Scenarios file not found: {self.scenarios_path}")
         
-        with open(self.scenarios_path, 'r') as f:
-            data = json.load(f)
+        mtime_ns = self.scenarios_path.stat().st_mtime_ns
+        cache_key = (str(self.scenarios_path.resolve()), mtime_ns)
+        scenarios = _SCENARIO_CACHE.get(cache_key)
+        
+        if scenarios is None:
+            cache_path = self.scenarios_path.with_suffix('.cache.pkl')
+            scenarios = self._read_scenario_cache(cache_path, mtime_ns)
+            
+            if scenarios is None:
+                scenarios = self._parse_scenarios()
+                self._write_scenario_cache(cache_path, mtime_ns, scenarios)
+            
+            _SCENARIO_CACHE[cache_key] = scenarios
         
-        self.scenarios = data['scenarios']
+        self.scenarios = scenarios
         self.num_scenarios = len(self.scenarios)
         
         print(f"[LOADED] {self.num_scenarios} scenarios from {self.scenarios_path}")
     
+    def _parse_scenarios(self) -> List[Dict]:
+        """Parse the scenario JSON and attach precomputed fields"""
+        # Memory-map the file and parse straight from the mapped buffer (no read() copy with orjson)
+        with open(self.scenarios_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if HAS_ORJSON:
+                with memoryview(mm) as view:
+                    data = orjson.loads(view)
+            else:
+                data = json.loads(mm[:])
+        
+        scenarios = data['scenarios']
+        for scenario in scenarios:
+            self._precompute_scenario(scenario)
+        self._index_technologies(scenarios)
+        return scenarios
+    
+    @staticmethod
+    def _read_scenario_cache(cache_path: Path, mtime_ns: int) -> Optional[List[Dict]]:
+        """Return cached scenarios if the pickle matches the JSON mtime and cache version"""
+        try:
+            with open(cache_path, 'rb') as f:
+                payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+        
+        if not isinstance(payload, dict) or payload.get('version') != SCENARIO_CACHE_VERSION \
+                or payload.get('mtime_ns') != mtime_ns:
+            return None
+        return payload['scenarios']
+    
+    @staticmethod
+    def _write_scenario_cache(cache_path: Path, mtime_ns: int, scenarios: List[Dict]):
+        """Best-effort pickle of parsed scenarios (read-only data dirs just skip the cache)"""
+        payload = {'version': SCENARIO_CACHE_VERSION, 'mtime_ns': mtime_ns, 'scenarios': scenarios}
+        try:
+            with open(cache_path, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            pass
+    
+    def _precompute_scenario(self, scenario: Dict):
+        """Attach per-scenario derivations that never change between steps (underscore keys)"""
+        tool_results = scenario['tool_results']
+        
+        subdomains = tool_results['subfinder']['subdomains']
+        hv_search = self._hv_re.search
+        scenario['_hv_mask'] = np.fromiter((bool(hv_search(s)) for s in subdomains),
+                                           dtype=bool, count=len(subdomains))
+        
+        services = tool_results['nmap']['services']
+        ports = np.array([svc['port'] for svc in services], dtype=np.int32)
+        scenario['_nmap_ports'] = ports
+        scenario['_nmap_is_critical'] = np.isin(ports, CRITICAL_PORTS_ARR)
+        scenario['_nmap_is_web'] = np.isin(ports, WEB_PORTS_ARR)
+        scenario['_nmap_has_version'] = np.fromiter((bool(svc.get('version')) for svc in services),
+                                                    dtype=bool, count=len(services))
+        scenario['_nmap_service_keys'] = [f"{svc.get('service', 'unknown')}:{svc['port']}"
+                                          for svc in services]
+        
+        # Coverage denominators (clamped to 1 so empty targets never divide by zero)
+        metadata = scenario['metadata']
+        scenario['_coverage_totals'] = (max(metadata['total_subdomains'], 1),
+                                        max(metadata['live_endpoints'], 1),
+                                        max(metadata['open_ports'], 1))
+        
+        # Port classification of the target (strategic bonus + observation group 4)
+        port_list = metadata['port_list']
+        bits = port_bits(port_list)
+        scenario['_port_bits'] = bits
+        has_web = bool(bits & STRATEGIC_WEB_MASK)
+        has_infra = bool(bits & STRATEGIC_INFRA_MASK)
+        infra_count = bin(bits & STRATEGIC_INFRA_MASK).count('1')
+        nmap_value = min(bin(bits & OBS_INFRA_MASK).count('1') / 5.0, 1.0)
+        scenario['_portinfo'] = {
+            'has_web': has_web,
+            'has_infra': has_infra,
+            'infra_count': infra_count,
+            'web_only': has_web and not has_infra,
+            'infra_heavy': infra_count >= 2,  # 2+ infrastructure ports = infrastructure target
+            'strategic_type': (STRATEGIC_INFRA_HEAVY if infra_count >= 2 else
+                               STRATEGIC_WEB_ONLY if has_web and not has_infra else
+                               STRATEGIC_HYBRID if has_infra else STRATEGIC_OTHER),
+            'has_infrastructure_ports': 1.0 if bits & OBS_INFRA_MASK else 0.0,
+            'has_custom_ports': 1.0 if bits & CUSTOM_PORT_MASK else 0.0,
+            'port_diversity': min(len(set(port_list)) / 20.0, 1.0),
+            'nmap_value': nmap_value,
+            'web_only_target': 1.0 if not bits & ~OBS_WEB_MASK else 0.0,
+            'database_ports_found': 1.0 if bits & OBS_DB_MASK else 0.0,
+            'admin_ports_found': 1.0 if bits & OBS_ADMIN_MASK else 0.0,
+            'scannable_ports': min(len(port_list) / 20.0, 1.0),
+        }
+        portinfo = scenario['_portinfo']
+        # Observation slots 30-37 in order, written with one slice assignment
+        scenario['_obs_ports'] = np.array([
+            portinfo['has_infrastructure_ports'], portinfo['has_custom_ports'],
+            portinfo['port_diversity'], portinfo['nmap_value'], portinfo['web_only_target'],
+            portinfo['database_ports_found'], portinfo['admin_ports_found'],
+            portinfo['scannable_ports'],
+        ], dtype=np.float32)
+    
+    @staticmethod
+    def _index_technologies(scenarios: List[Dict]):
+        """
+        Map every technology name in the file to a small int ID and attach, per httpx mode,
+        the IDs httpx reports (_tech_ids, endpoints concatenated) with per-endpoint prefix
+        offsets (_tech_offsets[level, k] = number of IDs from the first k endpoints).
+        """
+        names = sorted({tech for scenario in scenarios
+                        for endpoint in scenario['tool_results']['httpx']['endpoints']
+                        for tech in endpoint.get('tech_stack', ())})
+        vocab = {name: tech_id for tech_id, name in enumerate(names)}
+        
+        for scenario in scenarios:
+            endpoints = scenario['tool_results']['httpx']['endpoints']
+            tech_ids = []
+            offsets = np.zeros((len(HTTPX_TECH_DETAIL), len(endpoints) + 1), dtype=np.int64)
+            for level, tech_detail in enumerate(HTTPX_TECH_DETAIL):
+                ids = []
+                for k, endpoint in enumerate(endpoints, 1):
+                    if 'tech_stack' in endpoint:
+                        tech_count = int(len(endpoint['tech_stack']) * tech_detail)
+                        ids.extend(vocab[tech] for tech in endpoint['tech_stack'][:tech_count])
+                    offsets[level, k] = len(ids)
+                tech_ids.append(np.array(ids, dtype=np.int32))
+            scenario['_tech_ids'] = tuple(tech_ids)
+            scenario['_tech_offsets'] = offsets
+    
+    @property
+    def tools_used(self) -> Dict[str, Dict[str, Any]]:
+        """Per-tool usage as the legacy dict layout (materialized on access; read-only view)"""
+        return {
+            name: {
+                'used': bool(self._tool_used[tool_id]),
+                'mode': TOOL_MODES[tool_id][self._tool_mode[tool_id]] if self._tool_used[tool_id] else None,
+                'time': float(self._tool_time[tool_id]),
+                'results': self._tool_results[tool_id] or {},
+            }
+            for tool_id, name in enumerate(('subfinder', 'httpx', 'nmap'))
+        }
+    
+    def _found(self, key: str) -> int:
+        """Number of discovered items in a positional discovery mask (cached count)"""
+        return self._counts[key]
+    
+    def _add_discovery(self, key: str, index, values=True):
+        """OR values into discovery mask slots and refresh the mask's cached count"""
+        mask = self.discovered[key]
+        mask[index] |= values
+        self._counts[key] = int(np.count_nonzero(mask))
+    
     def action_masks(self) -> np.ndarray:
         """
         Get valid action mask for current phase (sequential workflow).
         
         Returns:
-            Boolean mask: 1=allowed, 0=blocked
+            Boolean mask: 1=allowed, 0=blocked (shared read-only array; copy before mutating)
         """
-        mask = np.zeros(10, dtype=np.int8)
-        
-        if self.current_phase == 0:
-            # Subfinder phase: Only actions 0-2
-            mask[0:3] = 1
-        elif self.current_phase == 1:
-            # HTTPX phase: Only actions 3-5
-            mask[3:6] = 1
-        elif self.current_phase == 2:
-            # Nmap phase: Actions 6-8 OR skip (action 9)
-            mask[6:10] = 1  # Allow nmap_quick, nmap_full, nmap_service, skip_nmap
-        
-        return mask
+        return self._PHASE_MASK_ROWS[self.current_phase]
+    
+    def action_logit_bias(self) -> np.ndarray:
+        """
+        Get action mask for current phase in the form a policy adds to its logits.
+        
+        Returns:
+            float32 bias: 0.0=allowed, -1e8=blocked (shared read-only array)
+        """
+        return self._PHASE_LOGIT_BIAS_ROWS[self.current_phase]
+    
+    def expected_reward_table(self) -> np.ndarray:
+        """
+        Expected reward of each action at each phase, per scenario (no step() needed).
+        
+        Tool ratios are taken at their midpoint and version detection at its expected rate.
+        Earlier phases follow the tool path with the highest expected return; invalid
+        actions score -10 (the step() penalty). Built on first call by replaying all
+        36 tool paths per scenario on a scratch env.
+        
+        Returns:
+            float32[num_scenarios, 3, 10] (read-only)
+        """
+        if self._expected_reward is None:
+            self._build_expected_rewards()
+        return self._expected_reward
+    
+    def expected_return_for_scenario(self, idx: int) -> float:
+        """Expected episode return of the best tool path for scenario idx (see expected_reward_table)"""
+        if self._expected_return is None:
+            self._build_expected_rewards()
+        return float(self._expected_return[idx])
+    
+    def _potential(self) -> float:
+        """
+        Shaping potential Phi(s): expected reward-to-go of the best remaining tool path
+        (expected_reward_table summed over the phases still ahead). Phi is 0 once the
+        episode has ended, which keeps the shaping policy-invariant (Ng et al., 1999).
+        """
+        if self.terminated or self.truncated:
+            return 0.0
+        if self._return_to_go is None:
+            self._build_expected_rewards()
+        return float(self._return_to_go[self.current_scenario_idx, self.current_phase])
+    
+    def _build_expected_rewards(self):
+        """Replay every (subfinder, httpx, nmap/skip) path per scenario with midpoint draws"""
+        scratch = FullReconEnv(scenarios_path=str(self.scenarios_path), time_budget=self.time_budget,
+                               max_steps=self.max_steps,
+                               strategic_reward_scale=self.strategic_reward_scale)
+        paths = [(a0, a1, a2) for a0 in range(0, 3) for a1 in range(3, 6) for a2 in range(6, 10)]
+        version_rates = (0.0, 0.5, 0.95)  # per nmap mode, as in _execute_nmap
+        
+        table = np.full((self.num_scenarios, 3, 10), -10.0, dtype=np.float32)
+        best_return = np.zeros(self.num_scenarios, dtype=np.float64)
+        
+        for idx, scenario in enumerate(self.scenarios):
+            versionable = scenario['_nmap_is_critical'] & scenario['_nmap_has_version']
+            path_rewards = []
+            for path in paths:
+                scratch.np_random = _MidpointDraws(idx)
+                scratch._soft_reset()
+                rewards = []
+                for action in path:
+                    _, reward, terminated, truncated, _ = scratch.step(action)
+                    if 6 <= action <= 8:
+                        # Versions add 60 each and feed nothing else: use the expected count
+                        n = scratch._tool_results[NMAP]['ports_found']
+                        reward += 60 * version_rates[action - 6] * int(np.count_nonzero(versionable[:n]))
+                    rewards.append(reward)
+                    if terminated or truncated:
+                        break
+                path_rewards.append(rewards)
+            
+            best = max(range(len(paths)), key=lambda i: sum(path_rewards[i]))
+            best_return[idx] = sum(path_rewards[best])
+            
+            # Phase p entries: every path that shares the best path's first p actions
+            for path, rewards in zip(paths, path_rewards):
+                for phase, (action, reward) in enumerate(zip(path, rewards)):
+                    if path[:phase] == paths[best][:phase]:
+                        table[idx, phase, action] = reward
+        
+        table.setflags(write=False)
+        self._expected_reward = table
+        self._expected_return = best_return
+        # Reward-to-go from each phase along the best expected actions (shaping potential)
+        best_per_phase = table.max(axis=2).astype(np.float64)
+        self._return_to_go = np.cumsum(best_per_phase[:, ::-1], axis=1)[:, ::-1]
     
     def reset(
         self,
         seed: Optional[int] = None,
         options: Optional[dict] = None,
+        scenario_idx: Optional[int] = None,
     ) -> Tuple[np.ndarray, Dict[str, Any]]:
         """
         Reset environment for new episode.
         
         Args:
             seed: Random seed
-            options: Optional reset parameters
+            options: Optional reset parameters ({'scenario_idx': i} works through wrappers)
+            scenario_idx: Play this scenario instead of drawing one at random
         
         Returns:
             observation: Initial state (40-dim)
             info: Episode metadata
         """
         super().reset(seed=seed)
-        
-        # Select random scenario
-        self.current_scenario_idx = self.np_random.integers(0, self.num_scenarios)
-        self.current_scenario = self.scenarios[self.current_scenario_idx]
+        if scenario_idx is None and options:
+            scenario_idx = options.get('scenario_idx')
+        return self._soft_reset(scenario_idx)
+    
+    def _soft_reset(self, scenario_idx: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """Start a new episode on the current RNG (no re-seeding; scenarios stay loaded)"""
+        # Select scenario (random unless one is requested)
+        if scenario_idx is None:
+            scenario_idx = self.np_random.integers(0, self.num_scenarios)
+        self.current_scenario_idx = scenario_idx
+        self.current_scenario = self.scenarios[scenario_idx]
         
         # Reset episode state
         self.step_count = 0
@@ -329,33 +968,32 @@ class FullReconEnv(gym.Env):
         self.truncated = False
         
         # Reset tool tracking
-        self.tools_used = {
-            'subfinder': {'used': False, 'mode': None, 'time': 0, 'results': {}},
-            'httpx': {'used': False, 'mode': None, 'time': 0, 'results': {}},
-            'nmap': {'used': False, 'mode': None, 'time': 0, 'results': {}},
-        }
-        
-        # Reset discovery
-        self.discovered = {
-            'subdomains': set(),
-            'high_value_subdomains': set(),
-            'live_endpoints': set(),
-            'technologies': set(),
-            'open_ports': set(),
-            'critical_services': set(),
-            'service_versions': {},
-        }
-        
-        # Reset rewards
+        self._tool_used.fill(False)
+        self._tool_time.fill(0.0)
+        self._tool_mode.fill(-1)
+        self._tool_results[SUBFINDER] = self._tool_results[HTTPX] = self._tool_results[NMAP] = None
+        self._tools_used_count = 0
+        
+        # Reset discovery in place (persistent buffers from __init__; no per-episode allocation)
+        discovered = self.discovered
+        discovered['subdomains_mask'].fill(False)
+        discovered['high_value_mask'].fill(False)
+        discovered['live_endpoints_mask'].fill(False)
+        discovered['ports_mask'].fill(False)
+        discovered['technologies_mask'].fill(False)
+        discovered['critical_services'].clear()
+        discovered['service_versions'].clear()
+        counts = self._counts
+        for key in counts:
+            counts[key] = 0
+        
+        # Reset rewards (breakdown dict zeroed in place; terminal infos get their own copy)
         self.total_reward = 0.0
         self.cumulative_reward = 0.0  # Reset for new episode
         self.current_step = 0  # Reset step counter
-        self.reward_breakdown = {
-            'discovery': 0.0,
-            'completion': 0.0,
-            'strategic': 0.0,
-            'efficiency': 0.0,
-        }
+        breakdown = self.reward_breakdown
+        for key in breakdown:
+            breakdown[key] = 0.0
         
         # Get initial observation
         obs = self._get_observation()
@@ -378,7 +1016,8 @@ class FullReconEnv(gym.Env):
             action: Action index (0-8)
         
         Returns:
-            observation: New state (40-dim)
+            observation: New state (40-dim; the reused buffer on non-terminal steps unless
+                copy_obs=True, a copy on terminal/truncated steps)
             reward: Reward for this action
             terminated: Episode finished successfully
             truncated: Episode ended early (timeout/error)
@@ -394,12 +1033,20 @@ class FullReconEnv(gym.Env):
         action_mask = self.action_masks()
         if not action_mask[action]:
             # Invalid action for current phase
+            obs = self._get_observation()
+            info = {'error': 'Invalid action for current phase'}
+            # Small penalty for invalid action (episode ends, so Phi(s') = 0)
+            reward = -10.0 - self._potential() if self._potential_shaping else -10.0
+            if self._auto_reset:
+                obs = self._begin_next_episode(obs, info)
+            elif not self._copy_obs:
+                obs = obs.copy()  # terminal: the caller's reset() would overwrite the buffer
             return (
-                self._get_observation(),
-                -10.0,  # Small penalty for invalid action
+                obs,
+                reward,
                 True,  # Terminate
                 False,
-                {'error': 'Invalid action for current phase'}
+                info
             )
         
         self.step_count += 1
@@ -407,45 +1054,43 @@ class FullReconEnv(gym.Env):
         action_name = self.action_names[action]
         
         # Execute tool action
+        phi = self._potential() if self._potential_shaping else 0.0
         reward, tool_results = self._execute_action(action, action_name)
-        self.cumulative_reward += reward  # Track cumulative reward for episode info
         
         # Check termination conditions
         self._check_termination()
         
+        # Potential-based shaping: F = gamma * Phi(s') - Phi(s)
+        if self._potential_shaping:
+            shaping = self._shaping_gamma * self._potential() - phi
+            reward += shaping
+            self.total_reward += shaping
+            self.reward_breakdown['shaping'] += shaping
+        self.cumulative_reward += reward  # Track cumulative reward for episode info
+        
         # Get new observation
         obs = self._get_observation()
         
-        # Build info dict
-        info = {
-            'step': self.step_count,
-            'action': action_name,
-            'phase': ['subfinder', 'httpx', 'nmap'][self.current_phase],
-            'time_elapsed': self.time_elapsed,
-            'reward_breakdown': self.reward_breakdown.copy(),
-            'total_reward': self.total_reward,
-            'action_masks': self.action_masks(),
-        }
+        # Update info payload in place (drop terminal/wrapper keys left from the previous step)
+        info = self._info_scratch
+        if len(info) != self._info_base_len:
+            info.clear()
+        info['step'] = self.step_count
+        info['action'] = action_name
+        info['phase'] = ('subfinder', 'httpx', 'nmap')[self.current_phase]
+        info['time_elapsed'] = self.time_elapsed
+        info['reward_breakdown'] = self.reward_breakdown  # live reference, not a copy
+        info['total_reward'] = self.total_reward
+        info['action_masks'] = self.action_masks()
         
         if self.terminated or self.truncated:
-            info['episode'] = {
-                'total_reward': self.total_reward,
-                'steps': self.step_count,
-                'time': self.time_elapsed,
-                'discoveries': {
-                    'subdomains': len(self.discovered['subdomains']),
-                    'live_endpoints': len(self.discovered['live_endpoints']),
-                    'open_ports': len(self.discovered['open_ports']),
-                    'services': len(self.discovered['critical_services']),
-                },
-            }
-            
             # Add metrics expected by training script (at top level for vectorized env access)
-            info['total_subdomains'] = len(self.discovered['subdomains'])
-            info['total_live'] = len(self.discovered['live_endpoints'])
-            info['total_ports'] = len(self.discovered['open_ports'])
+            info['total_subdomains'] = self._found('subdomains_mask')
+            info['total_live'] = self._found('live_endpoints_mask')
+            info['total_ports'] = self._found('ports_mask')
             info['total_services'] = len(self.discovered['critical_services'])
-            info['nmap_used'] = 1 if self.tools_used['nmap']['used'] else 0
+            info['nmap_used'] = 1 if self._tool_used[NMAP] else 0
+            info['reward_breakdown'] = dict(self.reward_breakdown)  # survives the next reset
             
             # Add episode info for Stable-Baselines3 logging (required!)
             info['episode'] = {
@@ -453,7 +1098,23 @@ class FullReconEnv(gym.Env):
                 'l': self.current_step
             }
         
-        return obs, reward, self.terminated, self.truncated, info
+        terminated, truncated = self.terminated, self.truncated
+        if terminated or truncated:
+            if self._auto_reset:
+                obs = self._begin_next_episode(obs, info)
+            elif not self._copy_obs:
+                # Vec wrappers keep this as info['terminal_observation'] / info['final_obs'] and
+                # then call reset(), which would overwrite the shared buffer (one copy per episode)
+                obs = obs.copy()
+        
+        return obs, reward, terminated, truncated, info
+    
+    def _begin_next_episode(self, obs: np.ndarray, info: Dict[str, Any]) -> np.ndarray:
+        """Auto-reset: stash the final observation in info and return the next episode's first one"""
+        # Without copy_obs, obs is the reused buffer that _soft_reset is about to overwrite
+        info['terminal_observation'] = obs if self._copy_obs else obs.copy()
+        next_obs, _ = self._soft_reset()
+        return next_obs
     
     def _execute_action(self, action: int, action_name: str) -> Tuple[float, Dict]:
         """
@@ -467,47 +1128,31 @@ class FullReconEnv(gym.Env):
             reward: Reward for this action
             results: Tool execution results
         """
-        results = {}
-        
-        # Determine which tool
-        if action <= 2:
-            # Subfinder
-            tool = 'subfinder'
-            mode = ['passive', 'active', 'comprehensive'][action]
-            results = self._execute_subfinder(mode)
-            self.current_phase = 1  # Move to HTTPX phase
-            
-        elif action <= 5:
-            # HTTPX
-            tool = 'httpx'
-            mode = ['basic', 'thorough', 'comprehensive'][action - 3]
-            results = self._execute_httpx(mode)
-            self.current_phase = 2  # Move to Nmap phase
-            
-        elif action <= 8:
-            # Nmap
-            tool = 'nmap'
-            mode = ['quick', 'full', 'service'][action - 6]
-            results = self._execute_nmap(mode)
-            self.terminated = True  # End after nmap
-            
-        else:  # action == 9
+        # Determine which tool (subfinder → HTTPX → nmap ends the episode)
+        tool, tool_id, mode, handler, next_phase, terminates = self._action_table[action]
+        
+        if handler is not None:
+            results = handler(mode)
+        else:
             # Skip Nmap - CONDITIONAL TERMINATION!
-            tool = 'skip'
-            mode = 'terminate'
             results = {
                 'time': 0,  # No time cost for skipping
                 'decision': 'skip_nmap',
                 'reason': 'Agent decided to skip nmap phase'
             }
-            self.terminated = True  # End without nmap
         
-        # Update tool tracking (skip doesn't have tools_used entry)
-        if tool != 'skip':
-            self.tools_used[tool]['used'] = True
-            self.tools_used[tool]['mode'] = mode
-            self.tools_used[tool]['time'] = results.get('time', 0)
-            self.tools_used[tool]['results'] = results
+        self.current_phase = next_phase
+        if terminates:
+            self.terminated = True  # End after nmap or skip
+        
+        # Update tool tracking (skip doesn't have a tool slot)
+        if tool_id != SKIP:
+            if not self._tool_used[tool_id]:
+                self._tools_used_count += 1
+            self._tool_used[tool_id] = True
+            self._tool_mode[tool_id] = mode
+            self._tool_time[tool_id] = results.get('time', 0)
+            self._tool_results[tool_id] = results
         
         self.time_elapsed += results.get('time', 0)
         
@@ -517,113 +1162,107 @@ class FullReconEnv(gym.Env):
         
         return reward, results
     
-    def _execute_subfinder(self, mode: str) -> Dict:
+    def _execute_subfinder(self, mode: int) -> Dict:
         """Execute subfinder scan (from pre-computed results)"""
         scenario_results = self.current_scenario['tool_results']['subfinder']
         
         # Get subdomains based on mode
         all_subdomains = scenario_results['subdomains']
         
-        if mode == 'passive':
+        if mode == MODE_PASSIVE:
             # Get 40-60% of subdomains
-            ratio = np.random.uniform(0.4, 0.6)
+            ratio = self.np_random.uniform(0.4, 0.6)
             count = int(len(all_subdomains) * ratio)
             subdomains = all_subdomains[:count]
             time_taken = scenario_results['execution_time_seconds'] * 0.3
             
-        elif mode == 'active':
+        elif mode == MODE_ACTIVE:
             # Get 70-85% of subdomains
-            ratio = np.random.uniform(0.7, 0.85)
+            ratio = self.np_random.uniform(0.7, 0.85)
             count = int(len(all_subdomains) * ratio)
             subdomains = all_subdomains[:count]
             time_taken = scenario_results['execution_time_seconds'] * 0.6
             
         else:  # comprehensive
             # Get 95-100% of subdomains
-            ratio = np.random.uniform(0.95, 1.0)
+            ratio = self.np_random.uniform(0.95, 1.0)
             count = int(len(all_subdomains) * ratio)
             subdomains = all_subdomains[:count]
             time_taken = scenario_results['execution_time_seconds']
         
-        # Update discoveries
-        self.discovered['subdomains'].update(subdomains)
+        # Update discoveries (results are always a prefix of the scenario list)
+        self._add_discovery('subdomains_mask', slice(0, count))
         
-        # Identify high-value subdomains
-        high_value_keywords = ['admin', 'api', 'db', 'database', 'mysql', 'postgres', 
-                               'redis', 'mail', 'smtp', 'vpn', 'backup', 'panel']
-        for subdomain in subdomains:
-            if any(kw in subdomain.lower() for kw in high_value_keywords):
-                self.discovered['high_value_subdomains'].add(subdomain)
+        # Identify high-value subdomains (keyword hits precomputed at load time)
+        hv_mask = self.current_scenario['_hv_mask'][:count]
+        self._add_discovery('high_value_mask', slice(0, count), hv_mask)
         
         return {
             'subdomains_found': len(subdomains),
-            'high_value_found': len([s for s in subdomains 
-                                    if any(kw in s.lower() for kw in high_value_keywords)]),
+            'high_value_found': int(np.count_nonzero(hv_mask)),
             'time': time_taken,
-            'mode': mode,
+            'mode': TOOL_MODES[SUBFINDER][mode],
         }
     
-    def _execute_httpx(self, mode: str) -> Dict:
+    def _execute_httpx(self, mode: int) -> Dict:
         """Execute HTTPX probe (from pre-computed results)"""
         scenario_results = self.current_scenario['tool_results']['httpx']
         
         # Get endpoints based on mode
         all_endpoints = scenario_results['endpoints']
         
-        if mode == 'basic':
+        if mode == MODE_BASIC:
             # Quick probe, 80-90% of live endpoints
-            ratio = np.random.uniform(0.8, 0.9)
+            ratio = self.np_random.uniform(0.8, 0.9)
             count = int(len(all_endpoints) * ratio)
             endpoints = all_endpoints[:count]
             time_taken = scenario_results['execution_time_seconds'] * 0.4
-            tech_detail = 0.5  # Basic tech detection
+            level = 0  # Basic tech detection (HTTPX_TECH_DETAIL: 50%)
             
-        elif mode == 'thorough':
+        elif mode == MODE_THOROUGH:
             # Thorough probe, 90-95% accuracy
-            ratio = np.random.uniform(0.9, 0.95)
+            ratio = self.np_random.uniform(0.9, 0.95)
             count = int(len(all_endpoints) * ratio)
             endpoints = all_endpoints[:count]
             time_taken = scenario_results['execution_time_seconds'] * 0.7
-            tech_detail = 0.8  # Good tech detection
+            level = 1  # Good tech detection (80%)
             
         else:  # comprehensive
             # Full probe, 95-100% accuracy
-            ratio = np.random.uniform(0.95, 1.0)
+            ratio = self.np_random.uniform(0.95, 1.0)
             count = int(len(all_endpoints) * ratio)
             endpoints = all_endpoints[:count]
             time_taken = scenario_results['execution_time_seconds']
-            tech_detail = 1.0  # All tech detected
+            level = 2  # All tech detected
         
-        # Update discoveries
-        for endpoint in endpoints:
-            self.discovered['live_endpoints'].add(endpoint['url'])
-            # Add technologies
-            if 'tech_stack' in endpoint:
-                tech_count = int(len(endpoint['tech_stack']) * tech_detail)
-                self.discovered['technologies'].update(endpoint['tech_stack'][:tech_count])
+        # Update discoveries (results are always a prefix of the scenario list)
+        self._add_discovery('live_endpoints_mask', slice(0, count))
+        # Technologies of the first `count` endpoints: one fancy-index store of precomputed IDs
+        tech_end = self.current_scenario['_tech_offsets'][level, count]
+        self._add_discovery('technologies_mask', self.current_scenario['_tech_ids'][level][:tech_end])
         
         return {
             'live_endpoints_found': len(endpoints),
-            'technologies_found': len(self.discovered['technologies']),
+            'technologies_found': self._found('technologies_mask'),
             'time': time_taken,
-            'mode': mode,
+            'mode': TOOL_MODES[HTTPX][mode],
         }
     
-    def _execute_nmap(self, mode: str) -> Dict:
+    def _execute_nmap(self, mode: int) -> Dict:
         """Execute nmap scan (from pre-computed results)"""
         scenario_results = self.current_scenario['tool_results']['nmap']
         
         # Get services based on mode
         all_services = scenario_results['services']
         
-        if mode == 'quick':
+        if mode == MODE_QUICK:
             # Quick scan: top 100 ports, no versions
             ports_found = min(len(all_services), int(len(all_services) * 0.6))
             services = all_services[:ports_found]
             time_taken = scenario_results['execution_time_seconds'] * 0.3
             get_versions = False
             
-        elif mode == 'full':
+        elif mode == MODE_FULL:
             # Full scan: all 1000 ports, some versions
             ports_found = int(len(all_services) * 0.9)
             services = all_services[:ports_found]
@@ -638,32 +1277,35 @@ class FullReconEnv(gym.Env):
             get_versions = True
             version_rate = 0.95
         
-        # Update discoveries
-        critical_ports = [22, 25, 445, 1433, 3306, 3389, 5432, 6379, 27017]
+        # Update discoveries (port classes precomputed at load time)
+        scenario = self.current_scenario
+        n = len(services)
+        ports = scenario['_nmap_ports'][:n]
+        is_critical = scenario['_nmap_is_critical'][:n]
+        self._add_discovery('ports_mask', ports)
         
-        for service in services:
-            port = service['port']
-            self.discovered['open_ports'].add(port)
-            
-            # Critical services
-            if port in critical_ports:
-                service_name = service.get('service', 'unknown')
-                self.discovered['critical_services'].add(f"{service_name}:{port}")
-                
-                # Service versions
-                if get_versions and service.get('version') and np.random.random() < version_rate:
-                    self.discovered['service_versions'][port] = service['version']
+        # Critical services
+        self.discovered['critical_services'].update(compress(scenario['_nmap_service_keys'][:n], is_critical))
+        
+        # Service versions (one vectorized draw for the whole scan)
+        if get_versions:
+            detected = is_critical & scenario['_nmap_has_version'][:n]
+            detected &= self.np_random.random(n) < version_rate
+            service_versions = self.discovered['service_versions']
+            for idx in np.flatnonzero(detected).tolist():
+                service_versions[int(ports[idx])] = services[idx]['version']
         
         return {
-            'ports_found': len(services),
-            'ports_list': [s['port'] for s in services],  # Add port list for reward calculation
-            'critical_services': len([s for s in services if s['port'] in critical_ports]),
+            'ports_found': n,
+            'ports_list': ports.tolist(),  # Add port list for reward calculation
+            'web_ports_found': int(np.count_nonzero(scenario['_nmap_is_web'][:n])),
+            'critical_services': int(np.count_nonzero(is_critical)),
             'versions_detected': len(self.discovered['service_versions']),
             'time': time_taken,
-            'mode': mode,
+            'mode': TOOL_MODES[NMAP][mode],
         }
     
-    def _calculate_reward(self, tool: str, mode: str, results: Dict) -> float:
+    def _calculate_reward(self, tool: str, mode: int, results: Dict) -> float:
         """
         Calculate reward using V2 positive-dominant philosophy.
         
@@ -675,106 +1317,44 @@ class FullReconEnv(gym.Env):
         
         Args:
             tool: Tool name
-            mode: Tool mode
+            mode: Tool mode id (index into TOOL_MODES[tool]; -1 for skip)
             results: Execution results
         
         Returns:
             Total reward for this action
         """
-        reward = 0.0
-        
-        # Component 1: Discovery Rewards - V16 ULTIMATE (V13 EXACT + high-value amplification)
-        if tool == 'subfinder':
-            subdomains_found = results.get('subdomains_found', 0)
-            high_value_found = results.get('high_value_found', 0)
-            
-            reward += subdomains_found * 43  # V13 EXACT value - proven optimal
-            reward += high_value_found * 95  # BOOST high-value for quality focus
-            
-            self.reward_breakdown['discovery'] += reward
-            
-        elif tool == 'httpx':
-            live_found = results.get('live_endpoints_found', 0)
-            tech_found = results.get('technologies_found', 0)
-            
-            reward += live_found * 32  # V13 EXACT - proven optimal
-            reward += tech_found * 22  # V13 EXACT - proven optimal
-            
-            self.reward_breakdown['discovery'] += reward
-            
-        elif tool == 'nmap':
-            ports_found = results.get('ports_found', 0)
-            critical_services = results.get('critical_services', 0)
-            versions = results.get('versions_detected', 0)
-            
-            # CONDITIONAL REWARDS - V16 ULTIMATE (V13 base + SERVICE AMPLIFICATION)
-            # This makes skipping nmap more attractive on web-only targets
-            web_ports = [80, 443, 8080, 8443, 3000, 5000]
-            ports_list = results.get('ports_list', [])
-            web_port_count = len([p for p in ports_list if p in web_ports])
-            infra_port_count = ports_found - web_port_count
-            
-            # V13 EXACT for ports, BOOST for services (key differentiator!)
-            reward += web_port_count * 22  # V13 EXACT
-            reward += infra_port_count * 65  # V13 EXACT  
-            reward += critical_services * 125  # BOOSTED! Services are gold!
-            reward += versions * 60  # BOOSTED! Version detection valuable!
-            
-            self.reward_breakdown['discovery'] += reward
-            
-        elif tool == 'skip':
-            # Skip nmap = 0 discovery reward (no new findings)
-            # But strategic bonus will reward if this was right decision!
-            pass
-        
-        # Component 2: Completion Bonus - AMPLIFIED 1.8x (ONLY after nmap - force 3-tool workflow!)
-        if tool == 'nmap':
-            coverage = self._calculate_coverage()
-            
-            if coverage > 0.8:
-                bonus = 540  # 300 × 1.8
-            elif coverage > 0.7:
-                bonus = 360  # 200 × 1.8
-            elif coverage > 0.6:
-                bonus = 270  # 150 × 1.8
-            elif coverage > 0.5:
-                bonus = 180  # 100 × 1.8
-            else:
-                bonus = 0  # NO PENALTY!
-            
-            reward += bonus
-            self.reward_breakdown['completion'] += bonus
-        elif self.terminated and not self.tools_used['nmap']['used']:
-            # Terminated without nmap = NO completion bonus!
-            # This encourages completing all 3 tools
-            pass
+        tool_id = TOOL_IDS[tool]
+        counts = self._counts
+        total_subdomains, total_live, total_ports = self.current_scenario['_coverage_totals']
+        
+        # Components 1, 2 and 4: Discovery, Completion and Efficiency (JIT numeric core)
+        discovery, completion, efficiency = reward_core(
+            tool_id,
+            int(results.get('subdomains_found', 0)),
+            int(results.get('high_value_found', 0)),
+            int(results.get('live_endpoints_found', 0)),
+            int(results.get('technologies_found', 0)),
+            int(results.get('web_ports_found', 0)),
+            int(results.get('ports_found', 0)) - int(results.get('web_ports_found', 0)),
+            int(results.get('critical_services', 0)),
+            int(results.get('versions_detected', 0)),
+            counts['subdomains_mask'], counts['live_endpoints_mask'], counts['ports_mask'],
+            total_subdomains, total_live, total_ports,
+            float(self.time_elapsed),
+        )
+        self.reward_breakdown['discovery'] += discovery
+        self.reward_breakdown['completion'] += completion
         
         # Component 3: Strategic Bonus (ONLY at episode end!)
         # Strategic decisions only matter when workflow is complete
+        strategic_bonus = 0.0
         if tool == 'nmap' or self.terminated:
             strategic_bonus = self._calculate_strategic_bonus()
-            reward += strategic_bonus
             self.reward_breakdown['strategic'] += strategic_bonus
         
-        # Component 4: Efficiency Bonus - V15 HYBRID (V13 base)
-        if tool == 'nmap':
-            if self.time_elapsed < 90:
-                efficiency_bonus = 227  # V13: 216, slight boost
-            elif self.time_elapsed < 120:
-                efficiency_bonus = 60
-            elif self.time_elapsed < 180:
-                efficiency_bonus = 30
-            else:
-                efficiency_bonus = 0  # NO PENALTY!
-            
-            reward += efficiency_bonus
-            self.reward_breakdown['efficiency'] += efficiency_bonus
-        elif self.terminated and not self.tools_used['nmap']['used']:
-            # Terminated without nmap = NO efficiency bonus!
-            # This encourages completing all 3 tools
-            pass
+        self.reward_breakdown['efficiency'] += efficiency
         
-        return reward
+        return discovery + completion + strategic_bonus + efficiency
     
     def _calculate_strategic_bonus(self) -> float:
         """
@@ -810,205 +1390,103 @@ class FullReconEnv(gym.Env):
         - Smart conditional usage: ~700 total (discovery + strategic)
         - Difference: 133% improvement (CRYSTAL CLEAR signal!)
         """
-        bonus = 0.0
-        
-        # Check if nmap was used and what mode
-        nmap_used = self.tools_used['nmap']['used']
-        nmap_mode = self.tools_used['nmap']['mode'] if nmap_used else None
-        
-        # Get scenario metadata
-        metadata = self.current_scenario['metadata']
-        port_list = metadata['port_list']
+        portinfo = self.current_scenario['_portinfo']
+        scenario_type = portinfo['strategic_type']  # classified once at load time
+        nmap_used = bool(self._tool_used[NMAP])
+        nmap_mode = int(self._tool_mode[NMAP])  # MODE_QUICK/FULL/SERVICE, -1 if skipped
+        nmap_outcome = nmap_mode + 1  # 0=skipped, 1=quick, 2=full, 3=service
+        
+        # Base bonus per (scenario type, nmap outcome) - V17 values, see STRATEGIC_BONUS_TABLE
+        bonus = STRATEGIC_BONUS_TABLE[scenario_type][nmap_outcome]
+        
+        if scenario_type == STRATEGIC_INFRA_HEAVY:
+            # EXTRA: Perfect mode selection on a complex infrastructure target
+            if nmap_mode == MODE_SERVICE and portinfo['infra_count'] >= 3:
+                bonus += STRATEGIC_EXTRA_INFRA_SERVICE  # TRIPLED from 400 - Strong complex target signal!
+            
+            # 3-TOOL WORKFLOW COMPLETION BONUS - V17 ULTIMATE (HUGE BOOST!)
+            # CONDITIONAL: Only on infrastructure targets, don't force 3 tools on web-only!
+            if self._tools_used_count == 3:
+                bonus += STRATEGIC_EXTRA_WORKFLOW  # DOUBLED from 2600 - BREAKTHROUGH INCENTIVE!
         
-        # Identify target type based on ports
-        web_ports = [80, 443, 8080, 8443, 3000, 5000]
-        infrastructure_ports = [22, 25, 445, 1433, 3306, 3389, 5432, 6379, 27017, 9200, 9092]
-        
-        has_web = any(p in web_ports for p in port_list)
-        has_infra = any(p in infrastructure_ports for p in port_list)
-        infra_count = len([p for p in port_list if p in infrastructure_ports])
-        web_only = has_web and not has_infra
-        infra_heavy = infra_count >= 2  # 2+ infrastructure ports = infrastructure target
-        
-        # SCENARIO TYPE 1: INFRASTRUCTURE HEAVY - V17 AGGRESSIVE (Force nmap usage!)
-        if infra_heavy:
-            if nmap_used:
-                if nmap_mode == 'service':
-                    # OPTIMAL: Service detection on infrastructure! ✅
-                    bonus += 4500  # TRIPLED from 1500 - Make nmap VERY attractive!
-                    # EXTRA: Perfect mode selection bonus!
-                    if infra_count >= 3:
-                        bonus += 1200  # TRIPLED from 400 - Strong complex target signal!
-                elif nmap_mode == 'full':
-                    # GOOD: Full scan also valuable on infrastructure
-                    bonus += 3600  # TRIPLED from 1200
-                elif nmap_mode == 'quick':
-                    # ACCEPTABLE: Quick mode is okay compromise
-                    bonus += 1800  # TRIPLED from 600
-            else:
-                # BAD: Skipping nmap on infrastructure is WRONG decision!
-                # MUCH STRONGER penalty to force nmap usage!
-                bonus -= 1200  # TRIPLED from 400 - Force nmap with strong negative signal!
-                
-        # SCENARIO TYPE 2: WEB ONLY - V17 BALANCED (Conditional nmap)
-        elif web_only:
-            if not nmap_used:
-                # OPTIMAL: Smart skip on web-only target! ✅
-                # Keep moderate reward so nmap is still preferred on infra
-                bonus += 800  # Reduced from 1000 - Balance with infra incentive
-            elif nmap_mode == 'quick':
-                # ACCEPTABLE: Quick mode is fast at least
-                bonus += 240  # DOUBLED from 120
-            else:
-                # WASTE: Using service/full mode on web-only is inefficient
-                # Small penalty for wasteful scanning
-                bonus -= 200  # Add penalty to discourage waste
-                
-        # SCENARIO TYPE 3: HYBRID - V17 AGGRESSIVE (Encourage nmap on hybrid!)
-        elif has_infra and nmap_used:
+        elif scenario_type == STRATEGIC_HYBRID and nmap_used:
             # Check if agent was selective (focused on high-value subdomains)
-            high_value_count = len(self.discovered['high_value_subdomains'])
-            total_subdomains = len(self.discovered['subdomains'])
+            high_value_count = self._found('high_value_mask')
+            total_subdomains = self._found('subdomains_mask')
             
             if high_value_count > 0 and total_subdomains > 0:
-                selectivity_ratio = high_value_count / total_subdomains
-                
-                if selectivity_ratio > 0.3 and nmap_mode == 'service':
-                    # OPTIMAL: Selective service scanning on high-value targets! ✅
-                    bonus += 3600  # TRIPLED from 1200 - Strong hybrid signal!
-                elif nmap_mode == 'service':
-                    # GOOD: Service mode on hybrid target
-                    bonus += 2250  # TRIPLED from 750
-                elif nmap_mode == 'quick':
-                    # ACCEPTABLE: Quick mode is okay compromise
-                    bonus += 1350  # TRIPLED from 450
+                if nmap_mode == MODE_SERVICE and high_value_count / total_subdomains > 0.3:
+                    # OPTIMAL: Selective service scanning on high-value targets (3600 total)
+                    bonus += STRATEGIC_EXTRA_HYBRID_SELECTIVE
             else:
-                # Default: Used nmap on mixed target (GOOD)
-                bonus += 1800  # TRIPLED from 600
-        elif has_infra and not nmap_used:
-            # BAD: Has infrastructure but skipped nmap!
-            bonus -= 800  # New penalty for missing nmap opportunity on hybrid
+                # Default: Used nmap on mixed target (GOOD), any mode
+                bonus = STRATEGIC_HYBRID_NONSELECTIVE  # TRIPLED from 600
         
         # ADDITIONAL BONUSES (smaller, secondary signals)
         
-        # 3-TOOL WORKFLOW COMPLETION BONUS - V17 ULTIMATE (HUGE BOOST!)
-        # CONDITIONAL: Only give bonus if nmap was APPROPRIATE!
-        # Don't force 3 tools on web-only targets!
-        if (self.tools_used['subfinder']['used'] and 
-            self.tools_used['httpx']['used'] and 
-            self.tools_used['nmap']['used'] and
-            infra_heavy):  # Only on infrastructure targets!
-            bonus += 5200  # DOUBLED from 2600 - BREAKTHROUGH INCENTIVE!
-        
         # Efficiency bonus (high discovery rate) - V17 AGGRESSIVE - ONLY if nmap used!
-        if nmap_used and len(self.discovered['subdomains']) > 0:
-            finds_per_second = len(self.discovered['subdomains']) / max(self.time_elapsed, 1)
+        counts = self._counts
+        n_subdomains = counts['subdomains_mask']
+        if nmap_used and n_subdomains > 0:
+            finds_per_second = n_subdomains / max(self.time_elapsed, 1)
             if finds_per_second > 1.0:
-                bonus += 432  # TRIPLED from 144 - Reward efficient nmap!
+                bonus += STRATEGIC_EXTRA_RATE  # TRIPLED from 144 - Reward efficient nmap!
             
             # NEW: Consistency bonus for balanced discoveries
-            if (len(self.discovered['subdomains']) > 8 and 
-                len(self.discovered['live_endpoints']) > 5 and
-                len(self.discovered['open_ports']) > 2):
-                bonus += 750  # TRIPLED from 250 - Strong comprehensive signal!
+            if (n_subdomains > 8 and 
+                counts['live_endpoints_mask'] > 5 and
+                counts['ports_mask'] > 2):
+                bonus += STRATEGIC_EXTRA_CONSISTENCY  # TRIPLED from 250 - Strong comprehensive signal!
         
-        return bonus
-    
-    def _calculate_coverage(self) -> float:
-        """Calculate discovery coverage (0-1)"""
-        metadata = self.current_scenario['metadata']
-        
-        # Calculate coverage components
-        subdomain_coverage = len(self.discovered['subdomains']) / max(metadata['total_subdomains'], 1)
-        endpoint_coverage = len(self.discovered['live_endpoints']) / max(metadata['live_endpoints'], 1)
-        port_coverage = len(self.discovered['open_ports']) / max(metadata['open_ports'], 1)
-        
-        # Weighted average
-        coverage = (subdomain_coverage * 0.4 + 
-                   endpoint_coverage * 0.3 + 
-                   port_coverage * 0.3)
-        
-        return min(coverage, 1.0)
+        return bonus * (self.strategic_reward_scale / STRATEGIC_BONUS_UNIT)
     
     def _check_termination(self):
-        """Check if episode should terminate"""
-        # Terminate after nmap (3 steps total)
-        if self.step_count >= self.max_steps:
-            self.terminated = True
-        
-        # Truncate on timeout
-        if self.time_elapsed >= self.time_budget:
-            self.truncated = True
+        """Check if episode should terminate (flags only ever go False -> True within an episode)"""
+        # Terminate after nmap (3 steps total); truncate on timeout
+        self.terminated = self.terminated or self.step_count >= self.max_steps
+        self.truncated = self.truncated or self.time_elapsed >= self._time_budget
     
     def _get_observation(self) -> np.ndarray:
         """
         Build 40-dimensional observation vector.
         
         Returns:
-            40-dim numpy array (all values 0-1)
+            40-dim numpy array of obs_dtype (values 0-1, or 0-255 for uint8); the same buffer
+            is reused across calls unless copy_obs=True
         """
-        obs = np.zeros(40, dtype=np.float32)
-        
-        metadata = self.current_scenario['metadata']
-        
-        # Group 1: Target Characteristics (8 dims)
-        obs[0] = min(metadata['total_subdomains'] / 30.0, 1.0)  # domain_complexity
-        obs[1] = min(len(self.discovered['subdomains']) / 30.0, 1.0)  # subdomain_count
-        obs[2] = min(len(self.discovered['live_endpoints']) / 25.0, 1.0)  # live_endpoint_count
-        obs[3] = self._calculate_coverage()  # scan_coverage
-        obs[4] = min(self.time_elapsed / self.time_budget, 1.0)  # time_elapsed
-        obs[5] = 1.0 if len(self.discovered['high_value_subdomains']) > 0 else 0.0  # critical_found
-        obs[6] = self.current_phase / 2.0  # current_phase (0/1/2 → 0/0.5/1.0)
-        obs[7] = self.step_count / self.max_steps  # phase_progress
-        
-        # Group 2: Tool Usage History (12 dims)
-        obs[8] = 1.0 if self.tools_used['subfinder']['used'] and self.tools_used['subfinder']['mode'] == 'passive' else 0.0
-        obs[9] = 1.0 if self.tools_used['subfinder']['used'] and self.tools_used['subfinder']['mode'] == 'active' else 0.0
-        obs[10] = 1.0 if self.tools_used['subfinder']['used'] and self.tools_used['subfinder']['mode'] == 'comprehensive' else 0.0
-        obs[11] = 1.0 if self.tools_used['httpx']['used'] and self.tools_used['httpx']['mode'] == 'basic' else 0.0
-        obs[12] = 1.0 if self.tools_used['httpx']['used'] and self.tools_used['httpx']['mode'] == 'thorough' else 0.0
-        obs[13] = 1.0 if self.tools_used['httpx']['used'] and self.tools_used['httpx']['mode'] == 'comprehensive' else 0.0
-        obs[14] = 1.0 if self.tools_used['nmap']['used'] and self.tools_used['nmap']['mode'] == 'quick' else 0.0
-        obs[15] = 1.0 if self.tools_used['nmap']['used'] and self.tools_used['nmap']['mode'] == 'full' else 0.0
-        obs[16] = 1.0 if self.tools_used['nmap']['used'] and self.tools_used['nmap']['mode'] == 'service' else 0.0
-        obs[17] = min(sum(1 for t in self.tools_used.values() if t['used']) / 3.0, 1.0)  # total_tools_used
-        obs[18] = min(self.tools_used['subfinder']['time'] / 60.0, 1.0)  # subfinder_time
-        obs[19] = min(self.tools_used['httpx']['time'] / 120.0, 1.0)  # httpx_time
-        
-        # Group 3: Discovery Metrics (10 dims)
-        obs[20] = min(len(self.discovered['subdomains']) / 30.0, 1.0)  # total_subdomains
-        obs[21] = min(len(self.discovered['high_value_subdomains']) / 10.0, 1.0)  # high_value_subdomains
-        obs[22] = min(len(self.discovered['live_endpoints']) / 25.0, 1.0)  # live_endpoints
-        obs[23] = min(len(self.discovered['technologies']) / 10.0, 1.0)  # technologies_found
-        obs[24] = min(len(self.discovered['open_ports']) / 20.0, 1.0)  # open_ports
-        obs[25] = min(len(self.discovered['critical_services']) / 10.0, 1.0)  # critical_services
-        obs[26] = min(len(self.discovered['service_versions']) / 10.0, 1.0)  # service_versions
-        obs[27] = min(len(self.discovered['subdomains']) / max(self.time_elapsed, 1) / 5.0, 1.0)  # discovery_rate
-        obs[28] = len(self.discovered['high_value_subdomains']) / max(len(self.discovered['subdomains']), 1)  # high_value_ratio
-        obs[29] = len(self.discovered['live_endpoints']) / max(len(self.discovered['subdomains']), 1)  # httpx_accuracy
-        
-        # Group 4: Nmap-Specific Context (10 dims)
-        port_list = metadata['port_list']
-        infrastructure_ports = [22, 25, 445, 1433, 3306, 3389, 5432, 6379, 27017]
-        web_ports = [80, 443, 8080, 8443, 3000]
-        
-        obs[30] = 1.0 if any(p in infrastructure_ports for p in port_list) else 0.0  # has_infrastructure_ports
-        obs[31] = 1.0 if any(p >= 4000 for p in port_list) else 0.0  # has_custom_ports
-        obs[32] = min(len(set(port_list)) / 20.0, 1.0)  # port_diversity
-        
-        # Estimate nmap value based on port types
-        infra_count = sum(1 for p in port_list if p in infrastructure_ports)
-        nmap_value = min(infra_count / 5.0, 1.0)
-        obs[33] = nmap_value  # nmap_value_estimate
-        
-        obs[34] = 1.0 if all(p in web_ports for p in port_list) else 0.0  # web_only_target
-        obs[35] = 1.0 if any(p in [3306, 5432, 6379, 27017] for p in port_list) else 0.0  # database_ports_found
-        obs[36] = 1.0 if any(p in [8443, 9090, 9000] for p in port_list) else 0.0  # admin_ports_found
-        obs[37] = min(len(port_list) / 20.0, 1.0)  # scannable_ports
-        obs[38] = min(self.tools_used['nmap']['time'] / 300.0, 1.0)  # nmap_time
-        obs[39] = nmap_value * 0.8  # nmap_expected_value (slightly lower than estimate)
-        
-        return obs
+        obs = self._obs  # every slot is rewritten by fill_observation
+        scenario = self.current_scenario
+        metadata = scenario['metadata']
+        discovered = self.discovered
+        counts = self._counts
+        
+        fill_observation(
+            obs,
+            counts['subdomains_mask'],
+            counts['high_value_mask'],
+            counts['live_endpoints_mask'],
+            counts['ports_mask'],
+            counts['technologies_mask'],
+            len(discovered['critical_services']),
+            len(discovered['service_versions']),
+            self._tools_used_count,
+            float(self.time_elapsed), self._time_budget,
+            self.current_phase, self.step_count, self._max_steps_inv,
+            self._tool_used, self._tool_mode, self._tool_time,
+            metadata['total_subdomains'], metadata['live_endpoints'], metadata['open_ports'],
+            scenario['_obs_ports'], scenario['_portinfo']['nmap_value'],
+        )
+        
+        out = self._obs_out
+        if out is not None:
+            if self._obs_scale is not None:
+                # Quantize in the float32 buffer (its values are not read again before the next fill)
+                np.multiply(obs, self._obs_scale, out=obs)
+                np.rint(obs, out=obs)
+            np.copyto(out, obs, casting='unsafe')
+            obs = out
+        
+        return obs.copy() if self._copy_obs else obs
     
     def render(self):
         """Render environment (optional)"""
@@ -1016,9 +1494,9 @@ class FullReconEnv(gym.Env):
             print(f"\n=== Step {self.step_count} ===")
             print(f"Phase: {['Subfinder', 'HTTPX', 'Nmap'][self.current_phase]}")
             print(f"Time: {self.time_elapsed:.1f}s / {self.time_budget}s")
-            print(f"Discovered: {len(self.discovered['subdomains'])} subdomains, "
-                  f"{len(self.discovered['live_endpoints'])} endpoints, "
-                  f"{len(self.discovered['open_ports'])} ports")
+            print(f"Discovered: {self._found('subdomains_mask')} subdomains, "
+                  f"{self._found('live_endpoints_mask')} endpoints, "
+                  f"{self._found('ports_mask')} ports")
             print(f"Reward: {self.total_reward:.1f}")
 
 
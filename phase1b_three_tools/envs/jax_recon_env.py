@@ -0,0 +1,389 @@
+"""
+PHASE 1B JAX ENVIRONMENT: pure-function FullReconEnv for jax.jit / jax.vmap
+===========================================================================
+
+Functional port of FullReconEnv (same V16/V17 reward and 40-dim observation)
+in the Gymnax style: episode state is a NamedTuple of JAX arrays, every branch
+is a jnp.where / jnp.select, and scenario data are padded prefix tables indexed
+by scenario id (the same tables BatchedFullReconEnv builds). A whole rollout can
+therefore be jitted and vmapped across thousands of episodes on GPU/TPU.
+
+Usage:
+    params = make_params('data/phase1b_train.json')
+    keys = jax.random.split(jax.random.PRNGKey(0), 4096)
+    state, obs = batched_reset(keys, params)
+    state, obs, reward, terminated, truncated, info = batched_step(keys, state, actions, params)
+
+step() auto-resets finished episodes (info['terminal_observation'] holds the
+last observation). JAX runs in float32/int32 unless jax_enable_x64 is set, so
+rewards match FullReconEnv to float32 precision (a coverage that lands exactly
+on a completion threshold, e.g. 0.7, can round to the other side) and
+trajectories match in distribution (JAX PRNG), not draw-for-draw.
+
+Requires jax (optional dependency); import fails softly with HAS_JAX = False.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .batched_full_recon_env import (
+    BatchedFullReconEnv, HTTPX_RATIO, HTTPX_TIME, NMAP_TIME, NMAP_VERSION_RATE,
+    PHASE_MASKS, SUBFINDER_RATIO, SUBFINDER_TIME,
+)
+from .full_recon_env import (
+    HTTPX, NMAP, STRATEGIC_BONUS_TABLE, STRATEGIC_BONUS_UNIT, STRATEGIC_EXTRA_CONSISTENCY,
+    STRATEGIC_EXTRA_HYBRID_SELECTIVE, STRATEGIC_EXTRA_INFRA_SERVICE, STRATEGIC_EXTRA_RATE,
+    STRATEGIC_EXTRA_WORKFLOW, STRATEGIC_HYBRID, STRATEGIC_HYBRID_NONSELECTIVE,
+    STRATEGIC_INFRA_HEAVY, STRATEGIC_OTHER, STRATEGIC_WEB_ONLY, SUBFINDER,
+)
+
+try:
+    import jax
+    import jax.numpy as jnp
+    HAS_JAX = True
+except ImportError:
+    HAS_JAX = False
+
+
+class EnvParams(NamedTuple):
+    """Static scenario tables (see BatchedFullReconEnv._build_scenario_tables)"""
+    num_scenarios: int
+    time_budget: float
+    max_steps: int
+    strategic_scale: float          # strategic_reward_scale / STRATEGIC_BONUS_UNIT
+    sub_count: 'jnp.ndarray'
+    ep_count: 'jnp.ndarray'
+    svc_count: 'jnp.ndarray'
+    exec_time: 'jnp.ndarray'        # [S, 3] subfinder / httpx / nmap base seconds
+    hv_prefix: 'jnp.ndarray'
+    tech_prefix: 'jnp.ndarray'
+    port_prefix: 'jnp.ndarray'
+    web_prefix: 'jnp.ndarray'
+    critical_prefix: 'jnp.ndarray'
+    versionable: 'jnp.ndarray'
+    infra_class_count: 'jnp.ndarray'
+    has_infra: 'jnp.ndarray'
+    web_only: 'jnp.ndarray'
+    infra_heavy: 'jnp.ndarray'
+    coverage_totals: 'jnp.ndarray'
+    static_obs: 'jnp.ndarray'
+
+
+class EnvState(NamedTuple):
+    """Per-episode state (scalars / length-3 tool arrays; vmapped to [B, ...])"""
+    scenario_idx: 'jnp.ndarray'
+    phase: 'jnp.ndarray'
+    step_count: 'jnp.ndarray'
+    time_elapsed: 'jnp.ndarray'
+    episode_return: 'jnp.ndarray'
+    tool_used: 'jnp.ndarray'
+    tool_mode: 'jnp.ndarray'
+    tool_time: 'jnp.ndarray'
+    n_subdomains: 'jnp.ndarray'
+    n_high_value: 'jnp.ndarray'
+    n_live: 'jnp.ndarray'
+    n_technologies: 'jnp.ndarray'
+    n_ports: 'jnp.ndarray'
+    n_critical: 'jnp.ndarray'
+    n_versions: 'jnp.ndarray'
+
+
+def make_params(
+    scenarios_path: str = "data/phase1b_train.json",
+    time_budget: float = 300.0,
+    max_steps: int = 3,
+    strategic_reward_scale: float = STRATEGIC_BONUS_UNIT,
+) -> EnvParams:
+    """Load scenarios through BatchedFullReconEnv and move its tables to JAX arrays"""
+    if not HAS_JAX:
+        raise ImportError("jax is required for jax_recon_env (pip install jax)")
+
+    tables = BatchedFullReconEnv(1, scenarios_path=scenarios_path, time_budget=time_budget,
+                                 max_steps=max_steps)
+    exec_time = np.stack([tables.sub_exec_time, tables.httpx_exec_time, tables.nmap_exec_time], axis=1)
+
+    return EnvParams(
+        num_scenarios=tables.num_scenarios,
+        time_budget=float(time_budget),
+        max_steps=int(max_steps),
+        strategic_scale=float(strategic_reward_scale / STRATEGIC_BONUS_UNIT),
+        sub_count=jnp.asarray(tables.sub_count),
+        ep_count=jnp.asarray(tables.ep_count),
+        svc_count=jnp.asarray(tables.svc_count),
+        exec_time=jnp.asarray(exec_time),
+        hv_prefix=jnp.asarray(tables.hv_prefix),
+        tech_prefix=jnp.asarray(tables.tech_prefix),
+        port_prefix=jnp.asarray(tables.port_prefix),
+        web_prefix=jnp.asarray(tables.web_prefix),
+        critical_prefix=jnp.asarray(tables.critical_prefix),
+        versionable=jnp.asarray(tables.versionable),
+        infra_class_count=jnp.asarray(tables.infra_class_count),
+        has_infra=jnp.asarray(tables.has_infra),
+        web_only=jnp.asarray(tables.web_only),
+        infra_heavy=jnp.asarray(tables.infra_heavy),
+        coverage_totals=jnp.asarray(tables.coverage_totals),
+        static_obs=jnp.asarray(tables.static_obs),
+    )
+
+
+if HAS_JAX:
+    _PHASE_MASKS = jnp.asarray(PHASE_MASKS)
+    _STRATEGIC_BONUS = jnp.asarray(STRATEGIC_BONUS_TABLE)
+    _SUB_LO, _SUB_HI = jnp.asarray(SUBFINDER_RATIO[0]), jnp.asarray(SUBFINDER_RATIO[1])
+    _HTTPX_LO, _HTTPX_HI = jnp.asarray(HTTPX_RATIO[0]), jnp.asarray(HTTPX_RATIO[1])
+    _TOOL_TIME = jnp.asarray(np.stack([SUBFINDER_TIME, HTTPX_TIME, NMAP_TIME]))
+    _VERSION_RATE = jnp.asarray(NMAP_VERSION_RATE)
+
+    def reset(key, params: EnvParams):
+        """Start an episode on a random scenario. Returns (state, obs)"""
+        zero_i = jnp.zeros((), dtype=jnp.int32)
+        zero_f = jnp.zeros((), dtype=jnp.float32)
+        state = EnvState(
+            scenario_idx=jax.random.randint(key, (), 0, params.num_scenarios),
+            phase=zero_i,
+            step_count=zero_i,
+            time_elapsed=zero_f,
+            episode_return=zero_f,
+            tool_used=jnp.zeros(3, dtype=bool),
+            tool_mode=jnp.full(3, -1, dtype=jnp.int32),
+            tool_time=jnp.zeros(3, dtype=jnp.float32),
+            n_subdomains=zero_i,
+            n_high_value=zero_i,
+            n_live=zero_i,
+            n_technologies=zero_i,
+            n_ports=zero_i,
+            n_critical=zero_i,
+            n_versions=zero_i,
+        )
+        return state, get_observation(state, params)
+
+    def _draws(key, mode, width):
+        """Random draws for one step: (subfinder ratio, httpx ratio, per-service version draws)"""
+        k_sub, k_httpx, k_ver = jax.random.split(key, 3)
+        sub_ratio = jax.random.uniform(k_sub, minval=_SUB_LO[mode], maxval=_SUB_HI[mode])
+        httpx_ratio = jax.random.uniform(k_httpx, minval=_HTTPX_LO[mode], maxval=_HTTPX_HI[mode])
+        version_draws = jax.random.uniform(k_ver, (width,))
+        return sub_ratio, httpx_ratio, version_draws
+
+    def step_env(key, state: EnvState, action, params: EnvParams):
+        """
+        One transition without auto-reset (branchless: every tool is evaluated, masks select).
+
+        Returns:
+            (state, obs, reward, terminated, truncated)
+        """
+        s = state.scenario_idx
+        tool = action // 3          # 0 subfinder, 1 httpx, 2 nmap, 3 skip
+        mode = action % 3
+
+        invalid = _PHASE_MASKS[state.phase, action] == 0
+        valid = ~invalid
+        is_sub = valid & (tool == SUBFINDER)
+        is_httpx = valid & (tool == HTTPX)
+        is_nmap = valid & (tool == NMAP)
+        uses_tool = is_sub | is_httpx | is_nmap
+        ending = valid & (tool >= NMAP)     # nmap or skip
+
+        width = params.versionable.shape[1]
+        sub_ratio, httpx_ratio, version_draws = _draws(key, mode, width)
+
+        # Subfinder: prefix of the subdomain list
+        sub_found = jnp.floor(params.sub_count[s] * sub_ratio).astype(jnp.int32)
+        hv_found = params.hv_prefix[s, sub_found]
+        n_subdomains = jnp.where(is_sub, jnp.maximum(state.n_subdomains, sub_found), state.n_subdomains)
+        n_high_value = jnp.where(is_sub, params.hv_prefix[s, n_subdomains], state.n_high_value)
+
+        # HTTPX: prefix of the endpoint list, tech detail per mode
+        live_found = jnp.floor(params.ep_count[s] * httpx_ratio).astype(jnp.int32)
+        n_live = jnp.where(is_httpx, jnp.maximum(state.n_live, live_found), state.n_live)
+        n_technologies = jnp.where(
+            is_httpx, jnp.maximum(state.n_technologies, params.tech_prefix[s, mode, live_found]),
+            state.n_technologies)
+
+        # Nmap: service prefix per mode, version detection on critical services
+        svc = params.svc_count[s]
+        nmap_found = jnp.select([mode == 0, mode == 1],
+                                [jnp.minimum(svc, jnp.floor(svc * 0.6).astype(jnp.int32)),
+                                 jnp.floor(svc * 0.9).astype(jnp.int32)], svc)
+        web = params.web_prefix[s, nmap_found]
+        critical = params.critical_prefix[s, nmap_found]
+        in_scan = jnp.arange(width) < nmap_found
+        versions = jnp.count_nonzero((version_draws < _VERSION_RATE[mode]) & in_scan & params.versionable[s])
+        n_ports = jnp.where(is_nmap, params.port_prefix[s, nmap_found], state.n_ports)
+        n_critical = jnp.where(is_nmap, critical, state.n_critical)
+        n_versions = jnp.where(is_nmap, versions, state.n_versions)
+
+        # Tool tracking and clock
+        tool_slot = uses_tool & (jnp.arange(3) == tool)
+        time_taken = jnp.where(uses_tool, params.exec_time[s, jnp.minimum(tool, 2)] * _TOOL_TIME[jnp.minimum(tool, 2), mode], 0.0)
+        time_elapsed = state.time_elapsed + time_taken
+        step_count = state.step_count + valid
+        phase = jnp.select([is_sub, is_httpx], [1, 2], state.phase)
+
+        new_state = state._replace(
+            phase=phase,
+            step_count=step_count,
+            time_elapsed=time_elapsed,
+            tool_used=state.tool_used | tool_slot,
+            tool_mode=jnp.where(tool_slot, mode, state.tool_mode),
+            tool_time=jnp.where(tool_slot, time_taken, state.tool_time),
+            n_subdomains=n_subdomains,
+            n_high_value=n_high_value,
+            n_live=n_live,
+            n_technologies=n_technologies,
+            n_ports=n_ports,
+            n_critical=n_critical,
+            n_versions=n_versions,
+        )
+
+        # Reward: discovery per tool, completion + efficiency after nmap, strategic on episode end
+        discovery = jnp.select(
+            [is_sub, is_httpx, is_nmap],
+            [sub_found * 43.0 + hv_found * 95.0,
+             live_found * 32.0 + n_technologies * 22.0,
+             web * 22.0 + (nmap_found - web) * 65.0 + critical * 125.0 + versions * 60.0],
+            0.0,
+        )
+        coverage = _coverage(new_state, params)
+        completion = jnp.select([coverage > 0.8, coverage > 0.7, coverage > 0.6, coverage > 0.5],
+                                [540.0, 360.0, 270.0, 180.0], 0.0)
+        efficiency = jnp.select([time_elapsed < 90, time_elapsed < 120, time_elapsed < 180],
+                                [227.0, 60.0, 30.0], 0.0)
+        reward = discovery + jnp.where(is_nmap, completion + efficiency, 0.0)
+        reward = reward + jnp.where(ending, _strategic_bonus(new_state, params), 0.0)
+        reward = jnp.where(invalid, -10.0, reward)
+
+        terminated = invalid | ending | (valid & (step_count >= params.max_steps))
+        truncated = valid & (time_elapsed >= params.time_budget)
+
+        new_state = new_state._replace(
+            episode_return=state.episode_return + jnp.where(valid, reward, 0.0))
+        return new_state, get_observation(new_state, params), reward, terminated, truncated
+
+    def step(key, state: EnvState, action, params: EnvParams):
+        """
+        One transition with auto-reset on terminated / truncated.
+
+        Returns:
+            (state, obs, reward, terminated, truncated, info) where info holds
+            terminal_observation, episode_return, episode_length and invalid_action
+        """
+        key_step, key_reset = jax.random.split(key)
+        next_state, obs, reward, terminated, truncated = step_env(key_step, state, action, params)
+        done = terminated | truncated
+
+        reset_state, reset_obs = reset(key_reset, params)
+        info = {
+            'terminal_observation': obs,
+            'episode_return': next_state.episode_return,
+            'episode_length': next_state.step_count,
+            'invalid_action': _PHASE_MASKS[state.phase, action] == 0,
+        }
+        next_state = jax.tree_util.tree_map(lambda r, n: jnp.where(done, r, n), reset_state, next_state)
+        obs = jnp.where(done, reset_obs, obs)
+        return next_state, obs, reward, terminated, truncated, info
+
+    def action_mask(state: EnvState):
+        """Valid action mask for the current phase (int8[10])"""
+        return _PHASE_MASKS[state.phase]
+
+    def _coverage(state: EnvState, params: EnvParams):
+        """Discovery coverage (0-1)"""
+        totals = params.coverage_totals[state.scenario_idx]
+        coverage = (state.n_subdomains / totals[0] * 0.4 +
+                    state.n_live / totals[1] * 0.3 +
+                    state.n_ports / totals[2] * 0.3)
+        return jnp.minimum(coverage, 1.0)
+
+    def _strategic_bonus(state: EnvState, params: EnvParams):
+        """V17 strategic bonus (BatchedFullReconEnv._strategic_bonus for one episode)"""
+        s = state.scenario_idx
+        infra_heavy = params.infra_heavy[s]
+        infra_count = params.infra_class_count[s]
+
+        nmap_used = state.tool_used[NMAP]
+        service = nmap_used & (state.tool_mode[NMAP] == 2)
+
+        n_sub = state.n_subdomains
+        n_hv = state.n_high_value
+        selective = (n_hv > 0) & (n_sub > 0)
+        ratio = n_hv / jnp.maximum(n_sub, 1)
+
+        # Base bonus per (scenario type, nmap outcome); outcome = nmap mode + 1, 0 if skipped
+        strategic_type = jnp.select(
+            [infra_heavy, params.web_only[s], params.has_infra[s]],
+            [STRATEGIC_INFRA_HEAVY, STRATEGIC_WEB_ONLY, STRATEGIC_HYBRID], STRATEGIC_OTHER,
+        )
+        outcome = jnp.where(nmap_used, state.tool_mode[NMAP] + 1, 0)
+        bonus = _STRATEGIC_BONUS[strategic_type, outcome]
+
+        # Infrastructure heavy: service mode on a complex target, 3-tool workflow completion
+        bonus = bonus + jnp.where(infra_heavy & service & (infra_count >= 3),
+                                  STRATEGIC_EXTRA_INFRA_SERVICE, 0.0)
+        bonus = bonus + jnp.where(infra_heavy & state.tool_used.all(), STRATEGIC_EXTRA_WORKFLOW, 0.0)
+        # Hybrid with nmap: selective service scan adds, non-selective replaces the base
+        hybrid_nmap = (strategic_type == STRATEGIC_HYBRID) & nmap_used
+        bonus = bonus + jnp.where(hybrid_nmap & selective & service & (ratio > 0.3),
+                                  STRATEGIC_EXTRA_HYBRID_SELECTIVE, 0.0)
+        bonus = jnp.where(hybrid_nmap & ~selective, STRATEGIC_HYBRID_NONSELECTIVE, bonus)
+
+        # Efficiency and consistency (only if nmap used)
+        finds_per_second = n_sub / jnp.maximum(state.time_elapsed, 1)
+        efficient = nmap_used & (n_sub > 0)
+        bonus = bonus + jnp.where(efficient & (finds_per_second > 1.0), STRATEGIC_EXTRA_RATE, 0.0)
+        consistent = efficient & (n_sub > 8) & (state.n_live > 5) & (state.n_ports > 2)
+        bonus = bonus + jnp.where(consistent, STRATEGIC_EXTRA_CONSISTENCY, 0.0)
+
+        return bonus * params.strategic_scale
+
+    def get_observation(state: EnvState, params: EnvParams):
+        """40-dim observation (same layout as FullReconEnv)"""
+        obs = params.static_obs[state.scenario_idx]
+
+        n_sub = state.n_subdomains
+        n_live = state.n_live
+        time_elapsed = state.time_elapsed
+
+        # Group 2: one-hot (tool, mode) at 8 + 3*tool + mode
+        tool_onehot = jnp.zeros(9).at[3 * jnp.arange(3) + jnp.maximum(state.tool_mode, 0)].set(
+            state.tool_used.astype(jnp.float32))
+
+        dynamic = jnp.concatenate([
+            jnp.stack([
+                # Group 1: Target Characteristics (slot 0 is static)
+                jnp.minimum(n_sub / 30.0, 1.0),
+                jnp.minimum(n_live / 25.0, 1.0),
+                _coverage(state, params),
+                jnp.minimum(time_elapsed / params.time_budget, 1.0),
+                (state.n_high_value > 0).astype(jnp.float32),
+                state.phase / 2.0,
+                state.step_count / params.max_steps,
+            ]),
+            tool_onehot,
+            jnp.stack([
+                jnp.minimum(jnp.count_nonzero(state.tool_used) / 3.0, 1.0),
+                jnp.minimum(state.tool_time[SUBFINDER] / 60.0, 1.0),
+                jnp.minimum(state.tool_time[HTTPX] / 120.0, 1.0),
+                # Group 3: Discovery Metrics
+                jnp.minimum(n_sub / 30.0, 1.0),
+                jnp.minimum(state.n_high_value / 10.0, 1.0),
+                jnp.minimum(n_live / 25.0, 1.0),
+                jnp.minimum(state.n_technologies / 10.0, 1.0),
+                jnp.minimum(state.n_ports / 20.0, 1.0),
+                jnp.minimum(state.n_critical / 10.0, 1.0),
+                jnp.minimum(state.n_versions / 10.0, 1.0),
+                jnp.minimum(n_sub / jnp.maximum(time_elapsed, 1) / 5.0, 1.0),
+                state.n_high_value / jnp.maximum(n_sub, 1),
+                n_live / jnp.maximum(n_sub, 1),
+            ]),
+        ])
+        obs = obs.at[1:30].set(dynamic)
+
+        # Group 4: Nmap-Specific Context (static except nmap_time)
+        obs = obs.at[38].set(jnp.minimum(state.tool_time[NMAP] / 300.0, 1.0))
+        return obs.astype(jnp.float32)
+
+    # Batched entry points: one PRNG key, state and action per episode; params shared
+    batched_reset = jax.jit(jax.vmap(reset, in_axes=(0, None)))
+    batched_step = jax.jit(jax.vmap(step, in_axes=(0, 0, 0, None)))
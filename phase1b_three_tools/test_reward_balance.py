@@ -4,6 +4,7 @@ Test REWARD REBALANCING - Make skipping attractive on web-only targets
 import sys
 sys.path.append('.')
 
+from envs.batched_full_recon_env import BatchedFullReconEnv
 from envs.full_recon_env import FullReconEnv
 import numpy as np
 
@@ -20,22 +21,24 @@ def test_reward_rebalancing():
     
     print(f"\n[LOADED] {len(env.scenarios)} scenarios")
     
-    # Find web-only and infrastructure scenarios
-    web_only_scenarios = []
-    infra_scenarios = []
+    # Find web-only and infrastructure scenarios (one bit per port of interest)
+    web_ports = [80, 443, 8080, 8443, 3000, 5000]
+    infra_ports = [22, 25, 445, 1433, 3306, 3389, 5432, 6379, 27017, 9200, 9092]
+    port_bit = {p: np.uint64(1 << b) for b, p in enumerate(web_ports + infra_ports)}
+    web_mask = np.bitwise_or.reduce([port_bit[p] for p in web_ports])
+    infra_mask = np.bitwise_or.reduce([port_bit[p] for p in infra_ports])
     
+    port_bitmasks = np.zeros(len(env.scenarios), dtype=np.uint64)
     for i, scenario in enumerate(env.scenarios):
-        ports = scenario['metadata']['port_list']
-        web_ports = [80, 443, 8080, 8443, 3000, 5000]
-        infra_ports = [22, 25, 445, 1433, 3306, 3389, 5432, 6379, 27017, 9200, 9092]
-        
-        has_web = any(p in web_ports for p in ports)
-        has_infra = any(p in infra_ports for p in ports)
-        
-        if has_web and not has_infra:
-            web_only_scenarios.append((i, scenario['id'], ports))
-        elif has_infra:
-            infra_scenarios.append((i, scenario['id'], ports))
+        for p in set(scenario['metadata']['port_list']) & port_bit.keys():
+            port_bitmasks[i] |= port_bit[p]
+    
+    has_web = (port_bitmasks & web_mask) != 0
+    has_infra = (port_bitmasks & infra_mask) != 0
+    web_only_scenarios = [(i, env.scenarios[i]['id'], env.scenarios[i]['metadata']['port_list'])
+                          for i in np.flatnonzero(has_web & ~has_infra)]
+    infra_scenarios = [(i, env.scenarios[i]['id'], env.scenarios[i]['metadata']['port_list'])
+                       for i in np.flatnonzero(has_infra)]
     
     print(f"\n📊 Scenario Analysis:")
     print(f"  Web-only scenarios: {len(web_only_scenarios)}")
@@ -50,9 +53,7 @@ def test_reward_rebalancing():
         print("-"*70)
         
         # Option A: Use nmap
-        env.reset()
-        env.current_scenario_idx = idx
-        env.current_scenario = env.scenarios[idx]
+        env.reset(scenario_idx=idx)
         obs, r1, _, _, _ = env.step(0)  # subfinder
         obs, r2, _, _, _ = env.step(3)  # httpx
         obs, r3, term, _, info = env.step(6)  # nmap_quick
@@ -66,9 +67,7 @@ def test_reward_rebalancing():
         print(f"  Breakdown: {env.reward_breakdown}")
         
         # Option B: Skip nmap
-        env.reset()
-        env.current_scenario_idx = idx
-        env.current_scenario = env.scenarios[idx]
+        env.reset(scenario_idx=idx)
         obs, r1, _, _, _ = env.step(0)  # subfinder
         obs, r2, _, _, _ = env.step(3)  # httpx
         obs, r3, term, _, info = env.step(9)  # skip_nmap
@@ -103,9 +102,7 @@ def test_reward_rebalancing():
         print("-"*70)
         
         # Option A: Use nmap
-        env.reset()
-        env.current_scenario_idx = idx
-        env.current_scenario = env.scenarios[idx]
+        env.reset(scenario_idx=idx)
         obs, r1, _, _, _ = env.step(0)  # subfinder
         obs, r2, _, _, _ = env.step(3)  # httpx
         obs, r3, term, _, info = env.step(8)  # nmap_service (optimal!)
@@ -119,9 +116,7 @@ def test_reward_rebalancing():
         print(f"  Breakdown: {env.reward_breakdown}")
         
         # Option B: Skip nmap
-        env.reset()
-        env.current_scenario_idx = idx
-        env.current_scenario = env.scenarios[idx]
+        env.reset(scenario_idx=idx)
         obs, r1, _, _, _ = env.step(0)  # subfinder
         obs, r2, _, _, _ = env.step(3)  # httpx
         obs, r3, term, _, info = env.step(9)  # skip_nmap
@@ -147,6 +142,23 @@ def test_reward_rebalancing():
         else:
             print(f"  ❌ WRONG! Skipping still better (+{-diff:.0f})")
     
+    # Test 3: every scenario at once (one batched pass per action sequence)
+    print("\n" + "="*70)
+    print("[TEST 3] ALL SCENARIOS (batched)")
+    print("-"*70)
+    
+    batch = BatchedFullReconEnv(len(env.scenarios), scenarios_path='data/phase1b_train.json',
+                                time_budget=180, max_steps=3)
+    all_idx = np.arange(len(env.scenarios))
+    skip_total = batch.simulate_fixed_actions((0, 3, 9), all_idx, seed=0)['total']
+    quick_total = batch.simulate_fixed_actions((0, 3, 6), all_idx, seed=0)['total']
+    service_total = batch.simulate_fixed_actions((0, 3, 8), all_idx, seed=0)['total']
+    
+    web_ok = (skip_total > quick_total)[has_web & ~has_infra]
+    infra_ok = (service_total > skip_total)[has_infra]
+    print(f"  Web-only: skip > nmap_quick on {web_ok.sum()}/{web_ok.size} scenarios")
+    print(f"  Infrastructure: nmap_service > skip on {infra_ok.sum()}/{infra_ok.size} scenarios")
+    
     print("\n" + "="*70)
     print("SUMMARY")
     print("="*70)
@@ -9,6 +9,7 @@ Phase 1B Environment Tests
 5. Episode flow (3-step)
 6. Reward calculation (positive-dominant)
 7. Performance (>500 steps/sec)
+8. Auto-reset vec env (SB3, wrapped envs)
 
 Author: Agent-P RL Team
 Date: 2025-11-13
@@ -17,12 +18,120 @@ Date: 2025-11-13
 import sys
 import os
 import time
+import multiprocessing
+from functools import lru_cache, partial
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
 import numpy as np
+import gymnasium as gym
+import pytest
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from envs.full_recon_env import FullReconEnv
+from envs.autoreset_vec_env import HAS_SB3, env_auto_resets
+
+
+SCENARIOS_PATH = "../data/phase1b_train.json"
+
+# Expected action mask per phase (subfinder 0-2 / httpx 3-5 / nmap 6-8 or skip 9)
+_EXPECTED_PHASE_MASKS = np.array([
+    [1, 1, 1, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 1, 1, 1, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 1, 1, 1, 1],
+], dtype=np.int8)
+
+
+@lru_cache(maxsize=None)
+def shared_env(scenarios_path: str = SCENARIOS_PATH) -> FullReconEnv:
+    """
+    One FullReconEnv per scenario file for the whole run; tests reset() it instead of
+    constructing their own (test 1 still builds a fresh one to check construction).
+    """
+    return FullReconEnv(scenarios_path=scenarios_path)
+
+
+def preload_scenarios(scenarios_path: str = SCENARIOS_PATH):
+    """
+    Parse the scenario file into full_recon_env's in-process cache.
+    
+    Call before forking workers: children inherit the cache (keyed by path and mtime)
+    and skip even the pickle load, and shared_env() is already built for them.
+    """
+    shared_env(scenarios_path)
+
+
+def make_vec_env(n: int, scenarios_path: str = SCENARIOS_PATH,
+                 asynchronous: Optional[bool] = None) -> gym.vector.VectorEnv:
+    """
+    N FullReconEnv copies behind one batched step().
+    
+    asynchronous=None picks AsyncVectorEnv (forked workers) for n >= 4. SyncVectorEnv is
+    used otherwise and wherever fork is unavailable (macOS/Windows spawn). Episodes reset
+    in the same step they end, so every tick is a real tool execution.
+    """
+    env_fns = [lambda: FullReconEnv(scenarios_path=scenarios_path) for _ in range(n)]
+    autoreset_mode = gym.vector.AutoresetMode.SAME_STEP
+    if asynchronous is None:
+        asynchronous = n >= 4
+    if asynchronous and 'fork' in multiprocessing.get_all_start_methods():
+        preload_scenarios(scenarios_path)
+        return gym.vector.AsyncVectorEnv(env_fns, context='fork', autoreset_mode=autoreset_mode)
+    return gym.vector.SyncVectorEnv(env_fns, autoreset_mode=autoreset_mode)
+
+
+def sample_masked_actions(masks: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """One uniformly random valid action per row of a stacked (n, actions) mask"""
+    return np.argmax(rng.random(masks.shape) * masks, axis=1).astype(np.int64)
+
+
+_episode_env = None  # per-process env for run_episodes (built once by _init_episode_worker)
+
+
+def _init_episode_worker(scenarios_path: str):
+    """Build this process's env once, so scenarios are parsed once per worker"""
+    global _episode_env
+    _episode_env = shared_env(scenarios_path)
+
+
+def _run_episode(seed: int) -> list:
+    """One episode of random valid actions; env and action draws both seeded by `seed`"""
+    env = _episode_env
+    rng = np.random.default_rng(seed)
+    obs, info = env.reset(seed=seed)
+    
+    episode_rewards = []
+    for step in range(3):
+        # Random valid action for current phase (index draw, no mask scan or choice())
+        valid_actions = FullReconEnv._PHASE_VALID[env.current_phase]
+        action = int(valid_actions[rng.integers(len(valid_actions))])
+        
+        obs, reward, terminated, truncated, info = env.step(action)
+        episode_rewards.append(reward)
+        
+        if terminated or truncated:
+            break
+    return episode_rewards
+
+
+def run_episodes(seeds, scenarios_path: str = SCENARIOS_PATH, max_workers: int = 1) -> list:
+    """
+    Per-step rewards of one random episode per seed, in seed order.
+    
+    max_workers > 1 spreads episodes over a process pool (one env per worker); results
+    do not depend on the worker count. Pool startup costs far more than a 3-step episode,
+    so only large sweeps come out ahead.
+    """
+    seeds = list(seeds)
+    if max_workers <= 1:
+        _init_episode_worker(scenarios_path)
+        return [_run_episode(seed) for seed in seeds]
+    preload_scenarios(scenarios_path)  # forked workers start with the parsed scenarios
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_episode_worker,
+                             initargs=(scenarios_path,)) as pool:
+        chunksize = max(1, len(seeds) // (4 * max_workers))
+        return list(pool.map(_run_episode, seeds, chunksize=chunksize))
 
 
 def test_1_initialization():
@@ -33,7 +142,7 @@ def test_1_initialization():
     
     try:
         env = FullReconEnv(
-            scenarios_path="../data/phase1b_train.json"
+            scenarios_path=SCENARIOS_PATH
         )
         print("✅ Environment created successfully")
         print(f"   Loaded {env.num_scenarios} scenarios")
@@ -45,15 +154,21 @@ def test_1_initialization():
         return False
 
 
-def test_2_state_space():
+@pytest.mark.parametrize("obs_dtype", [np.float32, np.float16, np.uint8])
+def test_2_state_space(obs_dtype):
     """Test 2: State space dimensions (40)"""
     print("\n" + "="*60)
     print("Test 2: State Space Validation")
     print("="*60)
     
     try:
-        env = FullReconEnv(scenarios_path="../data/phase1b_train.json")
+        obs_dtype = np.dtype(obs_dtype)
+        if obs_dtype == np.float32:
+            env = shared_env()
+        else:
+            env = FullReconEnv(scenarios_path=SCENARIOS_PATH, obs_dtype=obs_dtype)
         obs, info = env.reset()
+        high = env.observation_space.high[0]  # 1.0, or 255 for uint8
         
         # Check shape
         if obs.shape != (40,):
@@ -61,13 +176,13 @@ def test_2_state_space():
             return False
         
         # Check dtype
-        if obs.dtype != np.float32:
-            print(f"❌ Wrong dtype: {obs.dtype}, expected float32")
+        if obs.dtype != obs_dtype or env.observation_space.dtype != obs_dtype:
+            print(f"❌ Wrong dtype: {obs.dtype}, expected {obs_dtype}")
             return False
         
         # Check range
-        if not np.all((obs >= 0.0) & (obs <= 1.0)):
-            print(f"❌ Values out of range [0,1]: min={obs.min()}, max={obs.max()}")
+        if not np.all((obs >= 0) & (obs <= high)):
+            print(f"❌ Values out of range [0,{high}]: min={obs.min()}, max={obs.max()}")
             return False
         
         print("✅ State space correct:")
@@ -96,7 +211,7 @@ def test_3_action_space():
     print("="*60)
     
     try:
-        env = FullReconEnv(scenarios_path="../data/phase1b_train.json")
+        env = shared_env()
         
         # Check action space
         if env.action_space.n != 9:
@@ -125,12 +240,12 @@ def test_4_action_masking():
     print("="*60)
     
     try:
-        env = FullReconEnv(scenarios_path="../data/phase1b_train.json")
+        env = shared_env()
         obs, info = env.reset()
         
         # Phase 0: Should only allow subfinder (0-2)
         mask = env.action_masks()
-        expected = [1, 1, 1, 0, 0, 0, 0, 0, 0]
+        expected = _EXPECTED_PHASE_MASKS[0]
         if not np.array_equal(mask, expected):
             print(f"❌ Phase 0 mask wrong: {mask}, expected {expected}")
             return False
@@ -141,7 +256,7 @@ def test_4_action_masking():
         
         # Phase 1: Should only allow httpx (3-5)
         mask = env.action_masks()
-        expected = [0, 0, 0, 1, 1, 1, 0, 0, 0]
+        expected = _EXPECTED_PHASE_MASKS[1]
         if not np.array_equal(mask, expected):
             print(f"❌ Phase 1 mask wrong: {mask}, expected {expected}")
             return False
@@ -152,11 +267,11 @@ def test_4_action_masking():
         
         # Phase 2: Should only allow nmap (6-8)
         mask = env.action_masks()
-        expected = [0, 0, 0, 0, 0, 0, 1, 1, 1]
+        expected = _EXPECTED_PHASE_MASKS[2]
         if not np.array_equal(mask, expected):
             print(f"❌ Phase 2 mask wrong: {mask}, expected {expected}")
             return False
-        print("✅ Phase 2 (Nmap): Only actions 6-8 allowed")
+        print("✅ Phase 2 (Nmap): Only actions 6-8 and skip (9) allowed")
         
         return True
         
@@ -172,7 +287,7 @@ def test_5_episode_flow():
     print("="*60)
     
     try:
-        env = FullReconEnv(scenarios_path="../data/phase1b_train.json")
+        env = shared_env()
         obs, info = env.reset()
         
         print(f"Reset: {info['scenario_name']}")
@@ -211,11 +326,10 @@ def test_5_episode_flow():
         print(f"   Steps: {info['step']}")
         print(f"   Time: {info['time_elapsed']:.1f}s")
         print(f"   Discoveries:")
-        episode = info['episode']
-        print(f"      Subdomains: {episode['discoveries']['subdomains']}")
-        print(f"      Endpoints: {episode['discoveries']['live_endpoints']}")
-        print(f"      Ports: {episode['discoveries']['open_ports']}")
-        print(f"      Services: {episode['discoveries']['services']}")
+        print(f"      Subdomains: {info['total_subdomains']}")
+        print(f"      Endpoints: {info['total_live']}")
+        print(f"      Ports: {info['total_ports']}")
+        print(f"      Services: {info['total_services']}")
         
         return True
         
@@ -226,47 +340,34 @@ def test_5_episode_flow():
         return False
 
 
-def test_6_reward_positive():
+def test_6_reward_positive(max_workers: int = 1):
     """Test 6: Reward calculation (positive-dominant)"""
     print("\n" + "="*60)
     print("Test 6: Reward Calculation (Positive-Dominant)")
     print("="*60)
     
     try:
-        env = FullReconEnv(scenarios_path="../data/phase1b_train.json")
-        
         rewards_all = []
         
-        # Test 10 random episodes
-        for episode_num in range(10):
-            obs, info = env.reset()
-            
-            episode_rewards = []
-            
-            # Run full episode
-            for step in range(3):
-                action = env.action_space.sample()
-                # Ensure valid action for current phase
-                mask = env.action_masks()
-                valid_actions = [i for i, m in enumerate(mask) if m == 1]
-                action = np.random.choice(valid_actions)
-                
-                obs, reward, terminated, truncated, info = env.step(action)
-                episode_rewards.append(reward)
-                
-                if terminated or truncated:
-                    break
-            
+        # Test 10 random episodes (seeds 0-9)
+        for episode_num, episode_rewards in enumerate(run_episodes(range(10), max_workers=max_workers)):
             total = sum(episode_rewards)
             rewards_all.append(total)
             
-            # Check: NO negative total rewards (timeout should be 0)
+            # Negative totals are expected when a random policy skips nmap on an
+            # infrastructure target (V17 strategic penalty -1200)
             if total < 0:
-                print(f"❌ Episode {episode_num+1}: Negative reward {total:.1f}!")
-                print(f"   Breakdown: {episode_rewards}")
-                return False
+                print(f"   Episode {episode_num+1}: negative reward {total:.1f} {episode_rewards}")
+        
+        negative_fraction = np.mean(np.array(rewards_all) < 0)
+        if np.mean(rewards_all) <= 0:
+            print(f"❌ Mean reward not positive: {np.mean(rewards_all):.1f}")
+            return False
+        if negative_fraction > 0.3:
+            print(f"❌ Too many negative episodes: {negative_fraction:.0%} (max 30%)")
+            return False
         
-        print("✅ All rewards non-negative (Reward V2 validated!)")
+        print(f"✅ Rewards positive-dominant ({negative_fraction:.0%} negative episodes)")
         print(f"\n   Reward statistics (10 episodes):")
         print(f"   Mean: {np.mean(rewards_all):.1f}")
         print(f"   Std:  {np.std(rewards_all):.1f}")
@@ -287,50 +388,43 @@ def test_6_reward_positive():
         return False
 
 
-def test_7_performance():
+def test_7_performance(num_envs: int = 8, asynchronous: bool = False):
     """Test 7: Performance (>500 steps/sec)"""
     print("\n" + "="*60)
     print("Test 7: Performance Benchmark")
     print("="*60)
     
     try:
-        env = FullReconEnv(scenarios_path="../data/phase1b_train.json")
-        
-        # Warmup
-        for _ in range(5):
-            obs, info = env.reset()
-            for step in range(3):
-                mask = env.action_masks()
-                valid_actions = [i for i, m in enumerate(mask) if m == 1]
-                action = np.random.choice(valid_actions)
-                obs, reward, terminated, truncated, info = env.step(action)
-                if terminated or truncated:
-                    break
-        
-        # Benchmark
-        num_episodes = 100
-        start_time = time.time()
-        
-        total_steps = 0
-        for episode in range(num_episodes):
-            obs, info = env.reset()
+        # Sync by default: one step() is a few microseconds, so worker IPC costs more than it saves
+        venv = make_vec_env(num_envs, asynchronous=asynchronous)
+        rng = np.random.default_rng(0)
+        
+        try:
+            obs, info = venv.reset(seed=list(range(num_envs)))
+            
+            # Warmup (5 episodes per env)
+            for tick in range(15):
+                masks = np.stack(venv.call("action_masks"))
+                obs, rewards, terminated, truncated, info = venv.step(sample_masked_actions(masks, rng))
             
-            for step in range(3):
-                mask = env.action_masks()
-                valid_actions = [i for i, m in enumerate(mask) if m == 1]
-                action = np.random.choice(valid_actions)
-                
-                obs, reward, terminated, truncated, info = env.step(action)
-                total_steps += 1
-                
-                if terminated or truncated:
-                    break
-        
-        elapsed = time.time() - start_time
+            # Benchmark (~100 episodes per env, batched step per tick)
+            total_ticks = 300
+            start_time = time.time()
+            
+            for tick in range(total_ticks):
+                masks = np.stack(venv.call("action_masks"))
+                obs, rewards, terminated, truncated, info = venv.step(sample_masked_actions(masks, rng))
+            
+            elapsed = time.time() - start_time
+        finally:
+            venv.close()
+        
+        total_steps = num_envs * total_ticks
         steps_per_sec = total_steps / elapsed
         
         print(f"✅ Performance benchmark:")
-        print(f"   Episodes: {num_episodes}")
+        print(f"   Vector env: {type(venv).__name__} x {num_envs}")
+        print(f"   Ticks: {total_ticks}")
         print(f"   Total steps: {total_steps}")
         print(f"   Time: {elapsed:.2f}s")
         print(f"   Speed: {steps_per_sec:.1f} steps/sec")
@@ -344,11 +438,65 @@ def test_7_performance():
         
     except Exception as e:
         print(f"❌ Performance test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_8_autoreset_vec_env():
+    """Test 8: AutoResetDummyVecEnv on wrapped auto-resetting envs"""
+    print("\n" + "="*60)
+    print("Test 8: Auto-Reset Vec Env")
+    print("="*60)
+    
+    try:
+        make_wrapped = lambda: gym.wrappers.OrderEnforcing(
+            FullReconEnv(scenarios_path=SCENARIOS_PATH, auto_reset=True))
+        
+        # The flag must survive gymnasium wrappers (private attributes don't)
+        if not env_auto_resets(make_wrapped()) or env_auto_resets(shared_env()):
+            print("❌ metadata['autoreset'] not detected through wrapper")
+            return False
+        print("✅ Auto-reset detected through gymnasium wrapper")
+        
+        if not HAS_SB3:
+            print("⚠️  stable_baselines3 not installed, skipping vec env check")
+            return True
+        
+        from envs.autoreset_vec_env import AutoResetDummyVecEnv
+        venv = AutoResetDummyVecEnv([make_wrapped, lambda: FullReconEnv(scenarios_path=SCENARIOS_PATH)])
+        rng = np.random.default_rng(0)
+        venv.seed(0)
+        obs = venv.reset()
+        
+        episodes = 0
+        for tick in range(30):
+            masks = np.stack(venv.env_method("action_masks"))
+            obs, rewards, dones, infos = venv.step(sample_masked_actions(masks, rng))
+            next_masks = np.stack(venv.env_method("action_masks"))
+            for i in np.flatnonzero(dones):
+                terminal_obs = infos[i]["terminal_observation"]
+                # Next episode already started and the stashed terminal obs is its own array
+                if not np.array_equal(next_masks[i], _EXPECTED_PHASE_MASKS[0]):
+                    print(f"❌ Env {i} did not start a new episode: mask {next_masks[i]}")
+                    return False
+                if terminal_obs.shape != (40,) or np.array_equal(terminal_obs, obs[i]):
+                    print(f"❌ Env {i} terminal_observation wrong: {terminal_obs}")
+                    return False
+                episodes += 1
+        
+        print(f"✅ {episodes} episodes: terminal observations kept, next episode started")
+        return episodes > 0
+        
+    except Exception as e:
+        print(f"❌ Auto-reset vec env test failed: {e}")
+        import traceback
+        traceback.print_exc()
         return False
 
 
 def run_all_tests():
-    """Run all 7 tests"""
+    """Run all 8 tests"""
     print("\n" + "="*60)
     print("PHASE 1B ENVIRONMENT TEST SUITE")
     print("="*60)
@@ -357,12 +505,15 @@ def run_all_tests():
     
     tests = [
         ("Initialization", test_1_initialization),
-        ("State Space (40-dim)", test_2_state_space),
+        ("State Space (40-dim)", partial(test_2_state_space, np.float32)),
+        ("State Space (float16)", partial(test_2_state_space, np.float16)),
+        ("State Space (uint8)", partial(test_2_state_space, np.uint8)),
         ("Action Space (9)", test_3_action_space),
         ("Action Masking", test_4_action_masking),
         ("Episode Flow (3-step)", test_5_episode_flow),
         ("Reward V2 (positive)", test_6_reward_positive),
         ("Performance (>500/s)", test_7_performance),
+        ("Auto-Reset Vec Env", test_8_autoreset_vec_env),
     ]
     
     results = []
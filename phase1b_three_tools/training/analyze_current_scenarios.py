@@ -6,16 +6,73 @@ Understand patterns, gaps, and over-representations to design 80-scenario expans
 import json
 import sys
 from pathlib import Path
-from collections import Counter, defaultdict
-import pandas as pd
+from collections import Counter
+import numpy as np
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def classify_scenario_type(scenario_type: str) -> tuple:
+    """
+    Categories of one scenario_type string, computed once per distinct type.
+    
+    Returns (web_only, infrastructure, hybrid, matrix_column): the three Dimension 2 flags
+    (not exclusive; types matching none count as edge cases) and the size/type matrix
+    column (0=web, 1=infra, 2=hybrid).
+    """
+    k = scenario_type.lower()
+    web_only = 'web' in k and 'infra' not in k
+    infrastructure = 'infra' in k or 'database' in k or 'ssh' in k
+    hybrid = 'hybrid' in k or 'full' in k or 'mixed' in k
+    matrix_column = 0 if 'web' in k else 1 if 'infra' in k else 2
+    return web_only, infrastructure, hybrid, matrix_column
 
 def analyze_scenarios(scenarios_path: str):
     """Comprehensive analysis of current scenario set"""
     
     # Load scenarios
-    with open(scenarios_path, 'r') as f:
-        data = json.load(f)
-        scenarios = data['scenarios']
+    with open(scenarios_path, 'rb') as f:
+        raw = f.read()
+    data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+    scenarios = data['scenarios']
+    
+    # Single pass over the scenario dicts into per-field arrays/lists (structure of arrays)
+    n = len(scenarios)
+    scenario_ids = [None] * n
+    sizes = np.empty(n, dtype=np.int32)
+    scenario_types = [None] * n
+    port_tuples = [None] * n
+    all_technologies = []
+    all_subdomains = []
+    strategies = []
+    
+    for i, s in enumerate(scenarios):
+        metadata = s['metadata']
+        
+        scenario_ids[i] = s['id']
+        sizes[i] = metadata['total_subdomains']
+        scenario_types[i] = s['scenario_type']
+        
+        port_tuples[i] = tuple(sorted(metadata['port_list']))
+        
+        all_technologies.extend(metadata.get('technologies', []))
+        
+        if 'tool_results' in s and 'subfinder' in s['tool_results']:
+            subdomains = s['tool_results']['subfinder'].get('subdomains', [])
+            # Extract just subdomain prefix (before .domain.com)
+            all_subdomains.extend(sd.split('.')[0] for sd in subdomains if '.' in sd)
+        
+        if 'optimal_action_sequence' in s:
+            strategies.append(s['optimal_action_sequence'].get('nmap_mode', 'unknown'))
+    
+    # Classify each distinct scenario_type once; scenarios then map through the table
+    type_counts = Counter(scenario_types)
+    category_of = {stype: classify_scenario_type(stype) for stype in type_counts}
+    type_flags = np.fromiter((category_of[stype][3] for stype in scenario_types),
+                             dtype=np.uint8, count=n)  # size/type matrix column
     
     print("\n" + "="*80)
     print("TASK 1.1: CURRENT SCENARIO ANALYSIS (20 Scenarios)")
@@ -26,33 +83,26 @@ def analyze_scenarios(scenarios_path: str):
     print("DIMENSION 1: TARGET SIZE DISTRIBUTION")
     print("-" * 80)
     
-    subdomain_counts = []
-    for s in scenarios:
-        count = s['metadata']['total_subdomains']
-        subdomain_counts.append((s['id'], count))
+    small = int(((sizes >= 3) & (sizes <= 7)).sum())
+    medium = int(((sizes >= 8) & (sizes <= 15)).sum())
+    large = int(((sizes >= 16) & (sizes <= 25)).sum())
     
-    small = [(sid, c) for sid, c in subdomain_counts if 3 <= c <= 7]
-    medium = [(sid, c) for sid, c in subdomain_counts if 8 <= c <= 15]
-    large = [(sid, c) for sid, c in subdomain_counts if 16 <= c <= 25]
-    
-    print(f"Small (3-7 subdomains):   {len(small):2d} scenarios ({len(small)/len(scenarios)*100:5.1f}%)")
-    print(f"Medium (8-15 subdomains): {len(medium):2d} scenarios ({len(medium)/len(scenarios)*100:5.1f}%)")
-    print(f"Large (16-25 subdomains): {len(large):2d} scenarios ({len(large)/len(scenarios)*100:5.1f}%)")
+    print(f"Small (3-7 subdomains):   {small:2d} scenarios ({small/len(scenarios)*100:5.1f}%)")
+    print(f"Medium (8-15 subdomains): {medium:2d} scenarios ({medium/len(scenarios)*100:5.1f}%)")
+    print(f"Large (16-25 subdomains): {large:2d} scenarios ({large/len(scenarios)*100:5.1f}%)")
     print()
     print("TARGET for 80 scenarios: 31% small, 44% medium, 25% large")
-    print("CURRENT balance:", "✅ Good" if len(medium) >= len(small) and len(medium) >= len(large) else "⚠️ Imbalanced")
+    print("CURRENT balance:", "✅ Good" if medium >= small and medium >= large else "⚠️ Imbalanced")
     print()
     
     # === DIMENSION 2: Scenario Type Distribution ===
     print("DIMENSION 2: SCENARIO TYPE DISTRIBUTION")
     print("-" * 80)
     
-    type_counts = Counter([s['scenario_type'] for s in scenarios])
-    
     # Categorize into main types
-    web_only = sum(v for k, v in type_counts.items() if 'web' in k.lower() and 'infra' not in k.lower())
-    infrastructure = sum(v for k, v in type_counts.items() if 'infra' in k.lower() or 'database' in k.lower() or 'ssh' in k.lower())
-    hybrid = sum(v for k, v in type_counts.items() if any(x in k.lower() for x in ['hybrid', 'full', 'mixed']))
+    web_only = sum(v for k, v in type_counts.items() if category_of[k][0])
+    infrastructure = sum(v for k, v in type_counts.items() if category_of[k][1])
+    hybrid = sum(v for k, v in type_counts.items() if category_of[k][2])
     edge = len(scenarios) - web_only - infrastructure - hybrid
     
     for stype, count in sorted(type_counts.items()):
@@ -73,15 +123,9 @@ def analyze_scenarios(scenarios_path: str):
     print("DIMENSION 3: PORT PATTERN ANALYSIS")
     print("-" * 80)
     
-    port_patterns = []
-    port_pattern_counts = Counter()
+    port_pattern_counts = Counter(port_tuples)
     
-    for s in scenarios:
-        ports = tuple(sorted(s['metadata']['port_list']))
-        port_patterns.append((s['id'], ports))
-        port_pattern_counts[ports] += 1
-    
-    print(f"Total scenarios: {len(port_patterns)}")
+    print(f"Total scenarios: {len(port_tuples)}")
     print(f"Unique port patterns: {len(port_pattern_counts)}")
     print()
     
@@ -98,7 +142,7 @@ def analyze_scenarios(scenarios_path: str):
         print()
     
     print("Sample port patterns:")
-    for sid, ports in port_patterns[:10]:
+    for sid, ports in zip(scenario_ids[:10], port_tuples[:10]):
         print(f"  {sid:30s}: {ports}")
     print()
     print("TARGET for 80 scenarios: 80 UNIQUE patterns (one per scenario)")
@@ -109,11 +153,6 @@ def analyze_scenarios(scenarios_path: str):
     print("DIMENSION 4: TECHNOLOGY STACK VARIETY")
     print("-" * 80)
     
-    all_technologies = []
-    for s in scenarios:
-        techs = s['metadata'].get('technologies', [])
-        all_technologies.extend(techs)
-    
     tech_counts = Counter(all_technologies)
     unique_tech_count = len(tech_counts)
     
@@ -136,14 +175,6 @@ def analyze_scenarios(scenarios_path: str):
     print("DIMENSION 5: NAMING PATTERN ANALYSIS")
     print("-" * 80)
     
-    all_subdomains = []
-    for s in scenarios:
-        if 'tool_results' in s and 'subfinder' in s['tool_results']:
-            subdomains = s['tool_results']['subfinder'].get('subdomains', [])
-            # Extract just subdomain prefix (before .domain.com)
-            names = [sd.split('.')[0] for sd in subdomains if '.' in sd]
-            all_subdomains.extend(names)
-    
     name_counts = Counter(all_subdomains)
     unique_names = len(name_counts)
     
@@ -166,13 +197,7 @@ def analyze_scenarios(scenarios_path: str):
     print("DIMENSION 6: OPTIMAL STRATEGY DISTRIBUTION")
     print("-" * 80)
     
-    strategies = []
-    for s in scenarios:
-        if 'optimal_action_sequence' in s:
-            nmap_mode = s['optimal_action_sequence'].get('nmap_mode', 'unknown')
-            strategies.append((s['id'], nmap_mode))
-    
-    strategy_counts = Counter([mode for _, mode in strategies])
+    strategy_counts = Counter(strategies)
     
     print("Optimal strategy distribution:")
     for strategy, count in sorted(strategy_counts.items()):
@@ -191,19 +216,15 @@ def analyze_scenarios(scenarios_path: str):
     # Check if size correlates with type
     print("Checking: Does size correlate with scenario type?")
     
-    size_type_matrix = defaultdict(lambda: defaultdict(int))
-    for s in scenarios:
-        count = s['metadata']['total_subdomains']
-        stype = 'web' if 'web' in s['scenario_type'].lower() else 'infra' if 'infra' in s['scenario_type'].lower() else 'hybrid'
-        
-        size_cat = 'small' if count <= 7 else 'medium' if count <= 15 else 'large'
-        size_type_matrix[size_cat][stype] += 1
+    # 3x3 counts: rows small (<=7) / medium (<=15) / large, columns web / infra / hybrid
+    size_flags = (sizes > 7).astype(np.uint8) + (sizes > 15)
+    size_type_matrix = np.bincount(size_flags * 3 + type_flags, minlength=9).reshape(3, 3)
     
     print()
-    for size_cat in ['small', 'medium', 'large']:
+    for row, size_cat in enumerate(['small', 'medium', 'large']):
         print(f"  {size_cat:10s}:", end='')
-        for stype in ['web', 'infra', 'hybrid']:
-            count = size_type_matrix[size_cat][stype]
+        for col, stype in enumerate(['web', 'infra', 'hybrid']):
+            count = size_type_matrix[row, col]
             print(f"  {stype}: {count:2d}", end='')
         print()
     
@@ -228,8 +249,8 @@ def analyze_scenarios(scenarios_path: str):
         recommendations.append("✅ Port patterns are unique - maintain uniqueness in expansion")
     
     # Size distribution
-    if len(small) < len(scenarios) * 0.25:
-        recommendations.append(f"⚠️  Increase small scenarios: {len(small)} → 25 (in 80-set)")
+    if small < len(scenarios) * 0.25:
+        recommendations.append(f"⚠️  Increase small scenarios: {small} → 25 (in 80-set)")
     
     # Technology variety
     over_represented = [tech for tech, count in tech_counts.items() if count / len(scenarios) > 0.5]
@@ -261,9 +282,9 @@ def analyze_scenarios(scenarios_path: str):
     analysis_report = {
         "total_scenarios": len(scenarios),
         "size_distribution": {
-            "small": len(small),
-            "medium": len(medium),
-            "large": len(large)
+            "small": small,
+            "medium": medium,
+            "large": large
         },
         "type_distribution": {
             "web_only": web_only,
@@ -279,8 +300,12 @@ def analyze_scenarios(scenarios_path: str):
         "recommendations": recommendations
     }
     
-    with open('scenario_analysis_report.json', 'w') as f:
-        json.dump(analysis_report, f, indent=2)
+    if HAS_ORJSON:
+        with open('scenario_analysis_report.json', 'wb') as f:
+            f.write(orjson.dumps(analysis_report, option=orjson.OPT_INDENT_2))
+    else:
+        with open('scenario_analysis_report.json', 'w') as f:
+            json.dump(analysis_report, f, indent=2)
     
     print("Report saved to: scenario_analysis_report.json")
     print()
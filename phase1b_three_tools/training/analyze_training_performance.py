@@ -21,9 +21,15 @@ def evaluate_on_dataset(
     model_path: str,
     scenarios_file: str,
     dataset_name: str,
-    n_episodes: int = 50
+    n_episodes: int = 50,
+    n_envs: int = 10
 ) -> Dict:
-    """Evaluate model on specific dataset"""
+    """
+    Evaluate model on specific dataset.
+    
+    Runs n_envs envs side by side so model.predict does one batched forward pass per
+    step; the first n_episodes episodes to finish are kept.
+    """
     
     print(f"\n{'='*80}")
     print(f"EVALUATING ON {dataset_name.upper()}")
@@ -36,57 +42,62 @@ def evaluate_on_dataset(
     print("\nLoading model...")
     model = PPO.load(model_path)
     
-    # Create environment
+    # Create environments
     def make_env():
         return FullReconEnv(scenarios_path=scenarios_file)
-    env = DummyVecEnv([make_env])
+    env = DummyVecEnv([make_env for _ in range(n_envs)])
+    n_actions = env.action_space.n
+    scenario_ids = [s['id'] for s in env.get_attr('scenarios', [0])[0]]
     
     # Run evaluation
-    print(f"Running {n_episodes} episodes...")
+    print(f"Running {n_episodes} episodes ({n_envs} parallel envs)...")
     all_rewards = []
     all_lengths = []
-    nmap_usage_count = 0
-    total_actions = 0
     
-    # Track actions per scenario type
-    action_counts = {i: 0 for i in range(9)}
+    # Track actions and rewards per scenario
+    action_counts = np.zeros(n_actions, dtype=np.int64)
     scenario_rewards = {}  # Track rewards per scenario
     
-    for episode in range(n_episodes):
-        obs = env.reset()
-        episode_reward = 0
-        episode_length = 0
-        done = False
+    # Per-env running episode stats; the VecEnv resets each env itself when its episode ends
+    obs = env.reset()
+    env_ids = np.arange(n_envs)
+    episode_reward = np.zeros(n_envs)
+    episode_length = np.zeros(n_envs, dtype=np.int64)
+    episode_actions = np.zeros((n_envs, n_actions), dtype=np.int64)
+    episode_scenario = env.get_attr('current_scenario_idx')
+    
+    while len(all_rewards) < n_episodes:
+        actions, _states = model.predict(obs, deterministic=True)
+        obs, rewards, dones, infos = env.step(actions)
         
-        # Get current scenario ID from environment
-        current_scenario_id = env.envs[0].current_scenario['id'] if hasattr(env.envs[0], 'current_scenario') else f"ep_{episode}"
+        episode_reward += rewards
+        episode_length += 1
+        episode_actions[env_ids, actions] += 1
         
-        while not done:
-            action, _states = model.predict(obs, deterministic=True)
-            obs, reward, done, info = env.step(action)
-            
-            episode_reward += reward[0]
-            episode_length += 1
-            total_actions += 1
+        for i in np.flatnonzero(dones):
+            if len(all_rewards) < n_episodes:
+                all_rewards.append(float(episode_reward[i]))
+                all_lengths.append(int(episode_length[i]))
+                action_counts += episode_actions[i]
+                
+                # Store reward per scenario
+                scenario_id = scenario_ids[episode_scenario[i]]
+                scenario_rewards.setdefault(scenario_id, []).append(float(episode_reward[i]))
+                
+                if len(all_rewards) % 10 == 0:
+                    print(f"  {len(all_rewards)}/{n_episodes} episodes...")
             
-            # Track actions
-            action_counts[action[0]] += 1
-            if action[0] in [6, 7, 8]:  # nmap actions
-                nmap_usage_count += 1
-        
-        all_rewards.append(episode_reward)
-        all_lengths.append(episode_length)
-        
-        # Store reward per scenario
-        if current_scenario_id not in scenario_rewards:
-            scenario_rewards[current_scenario_id] = []
-        scenario_rewards[current_scenario_id].append(episode_reward)
-        
-        if (episode + 1) % 10 == 0:
-            print(f"  {episode + 1}/{n_episodes} episodes...")
+            # Env i already started its next episode
+            episode_reward[i] = 0.0
+            episode_length[i] = 0
+            episode_actions[i] = 0
+            episode_scenario[i] = env.get_attr('current_scenario_idx', [i])[0]
     
     env.close()
     
+    total_actions = int(action_counts.sum())
+    nmap_usage_count = int(action_counts[6:9].sum())  # nmap actions
+    
     # Calculate statistics
     rewards_array = np.array(all_rewards)
     mean_reward = np.mean(rewards_array)
@@ -119,7 +130,7 @@ def evaluate_on_dataset(
         'behavioral': {
             'mean_episode_length': float(mean_length),
             'nmap_usage_pct': float(nmap_usage_pct),
-            'action_distribution': {k: int(v) for k, v in action_counts.items()}
+            'action_distribution': {k: int(v) for k, v in enumerate(action_counts)}
         },
         'scenario_stats': scenario_stats,
         'all_rewards': [float(r) for r in all_rewards]
@@ -210,9 +221,9 @@ def compare_datasets(training_results: Dict, test_results: Dict, baseline_stats:
     print(f"{'='*80}\n")
     
     action_names = [
-        "subfinder", "httpx_light", "httpx_full",
-        "nmap_web_light", "nmap_web_full", "nmap_infra",
-        "nmap_skip", "nmap_quick", "nmap_service"
+        "subfinder_passive", "subfinder_active", "subfinder_comprehensive",
+        "httpx_basic", "httpx_thorough", "httpx_comprehensive",
+        "nmap_quick", "nmap_full", "nmap_service", "skip_nmap"
     ]
     
     print("TRAINING SET:")
@@ -6,7 +6,6 @@ MUCH FASTER than hand-crafting - JSON structure guaranteed compatible!
 """
 import json
 import random
-import copy
 from typing import List, Dict, Any
 from pathlib import Path
 
@@ -41,39 +40,52 @@ class ScenarioAugmentor:
             'db', 'cache', 'queue', 'worker', 'monitor', 'metrics', 'logs',
             'us-east', 'us-west', 'eu-central', 'asia', 'global', 'edge'
         ]
+        
+        # Augmentation type -> methods applied in order (unknown types only rename)
+        self._dispatch = {
+            'port_variation': (self._augment_ports,),          # Change port configuration while keeping type
+            'size_variation': (self._augment_size,),           # Add or remove subdomains
+            'tech_variation': (self._augment_technologies,),   # Change technology stack
+            'naming_variation': (self._augment_naming,),       # Change subdomain names
+            'combined': (self._augment_ports, self._augment_technologies),  # Multiple augmentations
+        }
+    
+    @staticmethod
+    def _fast_clone(scenario: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copy only the parts of a scenario the _augment_* methods modify.
+        
+        Top-level, metadata, subfinder and httpx dicts, the subdomain list (appended to
+        in place) and each httpx endpoint dict are copied; everything else (nmap results,
+        port/tech lists that get replaced rather than mutated, strings) is shared.
+        """
+        clone = scenario.copy()
+        clone['metadata'] = scenario['metadata'].copy()
+        
+        tool_results = scenario['tool_results']
+        clone['tool_results'] = tool_results.copy()
+        subfinder = tool_results['subfinder']
+        clone['tool_results']['subfinder'] = {**subfinder, 'subdomains': list(subfinder['subdomains'])}
+        httpx = clone['tool_results']['httpx'] = tool_results['httpx'].copy()
+        if 'endpoints' in httpx:
+            httpx['endpoints'] = [endpoint.copy() for endpoint in httpx['endpoints']]
+        
+        return clone
     
     def augment_scenario(self, base_scenario: Dict[str, Any], variant_id: int, 
                         augmentation_type: str) -> Dict[str, Any]:
         """Create variant of scenario with specific augmentation"""
         
-        # Deep copy to avoid modifying original
-        scenario = copy.deepcopy(base_scenario)
+        # Copy the mutable parts to avoid modifying original
+        scenario = self._fast_clone(base_scenario)
         
         # Update ID and name
         original_id = scenario['id']
         scenario['id'] = f"{original_id}_variant_{variant_id:02d}"
         scenario['name'] = f"{scenario['name']} - Variant {variant_id}"
         
-        if augmentation_type == 'port_variation':
-            # Change port configuration while keeping type
-            scenario = self._augment_ports(scenario)
-            
-        elif augmentation_type == 'size_variation':
-            # Add or remove subdomains
-            scenario = self._augment_size(scenario)
-            
-        elif augmentation_type == 'tech_variation':
-            # Change technology stack
-            scenario = self._augment_technologies(scenario)
-            
-        elif augmentation_type == 'naming_variation':
-            # Change subdomain names
-            scenario = self._augment_naming(scenario)
-            
-        elif augmentation_type == 'combined':
-            # Multiple augmentations
-            scenario = self._augment_ports(scenario)
-            scenario = self._augment_technologies(scenario)
+        for augment in self._dispatch.get(augmentation_type, ()):
+            scenario = augment(scenario)
         
         return scenario
     
@@ -101,7 +113,7 @@ class ScenarioAugmentor:
             new_ports.extend(random.sample(self.port_pools['db'], 1))
         
         # Update metadata
-        scenario['metadata']['port_list'] = sorted(list(set(new_ports)))
+        scenario['metadata']['port_list'] = sorted(set(new_ports))
         scenario['metadata']['open_ports'] = len(new_ports)
         
         # Update critical services count
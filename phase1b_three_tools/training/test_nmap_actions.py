@@ -28,7 +28,7 @@ print()
 print("[STEP 1] Action: subfinder_active (action 0)")
 obs, reward, term, trunc, info = env.step(0)
 print(f"  Reward: {reward:.1f}")
-print(f"  Subdomains found: {len(env.discovered['subdomains'])}")
+print(f"  Subdomains found: {np.count_nonzero(env.discovered['subdomains_mask'])}")
 print(f"  Tool used: {env.tools_used['subfinder']}")
 print()
 
@@ -36,7 +36,7 @@ print()
 print("[STEP 2] Action: httpx_thorough (action 4)")
 obs, reward, term, trunc, info = env.step(4)
 print(f"  Reward: {reward:.1f}")
-print(f"  Endpoints found: {len(env.discovered['live_endpoints'])}")
+print(f"  Endpoints found: {np.count_nonzero(env.discovered['live_endpoints_mask'])}")
 print(f"  Tool used: {env.tools_used['httpx']}")
 print()
 
@@ -59,7 +59,7 @@ for nmap_action in [6, 7, 8]:  # quick, full, service
     print(f"    Terminated: {term}")
     print(f"    Nmap used: {env.tools_used['nmap']['used']}")
     print(f"    Nmap mode: {env.tools_used['nmap']['mode']}")
-    print(f"    Ports found: {len(env.discovered['open_ports'])}")
+    print(f"    Ports found: {np.count_nonzero(env.discovered['ports_mask'])}")
     print(f"    Reward breakdown: {env.reward_breakdown}")
     print()
 